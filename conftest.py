@@ -3,11 +3,351 @@
 
 Currently provides:
 - `api_request_context`: a shared Playwright API client configured with pytest-base-url.
+- `worker_app`: with `--per-worker-app`, a private app-under-test instance (own port,
+  own copy of `shop.db`) for this pytest process, so `pytest -n auto` is safe; with
+  `--standin`, that app is the in-process Python stand-in.
+- `base_url`: pytest-base-url's value, redirected to `worker_app` when it is running.
+- `db_connections`: closes the pooled `utils.dbHelpers` connections at session end.
+- `db_snapshot` / `clean_db`: capture `shop.db` once per session and restore it before a
+  test (optionally only the tables named by `@pytest.mark.dirty_tables(...)`).
+- `cart_state`: establish a whole cart (e.g. `{1: 10, 3: 2}`) in one bulk operation.
+- `context_pool` / `page`: with `--context-pool`, UI tests get pages from reusable, reset
+  browser contexts instead of a fresh context per test.
+- `asset_cache`: with `--asset-cache`, `page` serves static assets (CSS/JS/images) from disk.
+- `navigation_metrics`: with `--nav-metrics`, record page-load timings from `go_home`/`go_cart`
+  and assert them against the `navigation_budgets` in pytest.ini.
 """
 
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+import json  # navigation metrics records
+import os  # read app location / xdist worker id from the environment
+import sqlite3  # prepare the golden snapshot
+from contextlib import closing  # close the snapshot connection deterministically
 import pytest  # pytest fixture decorator and scopes
-from typing import Generator  # precise type for a yielding fixture
-from playwright.sync_api import APIRequestContext, Playwright  # Playwright types used by the fixture
+from pathlib import Path  # snapshot file location
+from typing import TYPE_CHECKING, Callable, Generator, Mapping, Optional  # precise type for a yielding fixture
+from dotenv import load_dotenv  # optional .env for option defaults (STANDIN_APP, SHARD, Qase token, ...)
+
+from utils import dbHelpers as db  # retarget DB helpers at the worker's database copy
+
+# App, browser and UI helpers are imported inside the fixtures that use them, so a
+# DB- or API-only run does not load them at startup.
+if TYPE_CHECKING:
+    from playwright.sync_api import APIRequestContext, Browser, Page, Playwright
+    from utils.app_server import AppServer
+    from utils.asset_cache import AssetCache
+    from utils.browser_pool import ContextPool
+    from utils.standin_server import StandInApp
+
+# Read .env once, before any option default looks at the environment (utils.dbHelpers
+# itself only reads it when DB_PATH is first resolved).
+load_dotenv()
+
+# Project plugins (each documents its own options; see TESTING.md)
+pytest_plugins = ["plugins.phase_timing", "plugins.query_profile", "plugins.failure_trace", "plugins.qase_buffered",
+                  "plugins.sharding", "plugins.resource_monitor", "plugins.impact_map"]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register project options (see TESTING.md → Running Tests in Parallel)."""
+    group = parser.getgroup("app-under-test")
+    group.addoption(
+        "--per-worker-app",
+        action="store_true",
+        default=os.getenv("PER_WORKER_APP", "").lower() in ("1", "true", "yes"),
+        help="Start a private app instance with its own copy of shop.db for each worker.",
+    )
+    group.addoption(
+        "--standin",
+        action="store_true",
+        default=os.getenv("STANDIN_APP", "").lower() in ("1", "true", "yes"),
+        help="Serve the app from the in-process Python stand-in instead of the Node app.",
+    )
+
+    ui = parser.getgroup("ui-speed", "UI setup speedups")
+    ui.addoption("--context-pool", action="store_true", help="Reuse pooled, reset browser contexts for `page`.")
+    ui.addoption("--context-pool-size", type=int, default=2, help="Browser contexts kept per worker.")
+    ui.addoption("--context-pool-prewarm", action="store_true", help="Start loading base_url in pooled pages ahead of use.")
+    ui.addoption("--storage-state", default="build/storage_state.json", help="Storage state file pooled contexts start from.")
+    ui.addoption("--asset-cache", action="store_true", help="Serve static assets for `page` from an on-disk cache.")
+    ui.addoption("--asset-cache-dir", default="build/asset-cache", help="Folder for cached static assets.")
+    ui.addoption("--asset-cache-max-age", type=float, default=300.0, help="Seconds before a cached asset is revalidated.")
+    ui.addoption("--nav-metrics", action="store_true", help="Record page-load timings and enforce navigation_budgets.")
+    ui.addoption("--nav-metrics-dir", default="build/nav-metrics", help="Folder for recorded navigation metrics.")
+
+    perf = parser.getgroup("perf", "Load/latency benchmark (`pytest -m perf`)")
+    perf.addoption("--perf-duration", type=float, default=5.0, help="Seconds to drive each endpoint.")
+    perf.addoption("--perf-concurrency", type=int, default=8, help="Concurrent requests per endpoint.")
+    perf.addoption("--perf-report", default="build/perf/report.json", help="Where to write the JSON report.")
+    perf.addoption("--perf-baseline", default="tests/perf/baseline.json", help="Baseline JSON to compare against.")
+    perf.addoption("--perf-threshold", type=float, default=0.2, help="Allowed regression vs baseline (0.2 = 20%%).")
+    perf.addoption("--perf-update-baseline", action="store_true", help="Merge this run's stats into the baseline.")
+
+    stress = parser.getgroup("stress", "Concurrency stress suite (`pytest -m stress`)")
+    stress.addoption("--stress-seed", type=int, default=None, help="Seed for the request mix (default: random).")
+    stress.addoption("--stress-requests", type=int, default=500, help="Add-to-cart requests per stress test.")
+    stress.addoption("--stress-concurrency", type=int, default=32, help="Requests in flight at once.")
+
+    scale = parser.getgroup("scale", "Data-volume scaling suite (`pytest -m scale`)")
+    scale.addoption("--scale-sizes", default="10,1000,10000,100000", help="Comma-separated catalog sizes to seed.")
+    scale.addoption("--scale-cart-lines", type=int, default=1000, help="Max cart lines seeded per size (capped at the size).")
+    scale.addoption("--scale-max-slope", type=float, default=1.2, help="Fail when log-log growth between sizes exceeds this.")
+    scale.addoption("--scale-report", default="build/scale/report.json", help="Where to write the scaling curve JSON.")
+
+    parser.addini(
+        "navigation_budgets",
+        type="linelist",
+        default=[],
+        help="Page-load budgets as `metric = limit` or `page.metric = limit` (see pytest.ini).",
+    )
+    parser.addini("app_command", default="npm start", help="Command that starts the app-under-test.")
+    parser.addini("app_dir", default="app-under-test", help="Working directory for app_command.")
+    parser.addini("app_start_timeout", default="60", help="Seconds to wait for a per-worker app to answer.")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """With `--nav-metrics`, drop the previous run's records (controller / single process only)."""
+    if not config.getoption("nav_metrics") or hasattr(config, "workerinput"):
+        return
+    for old in Path(config.getoption("nav_metrics_dir")).glob("nav-*.jsonl"):
+        old.unlink()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def db_connections() -> Generator[None, None, None]:
+    """Close every cached SQLite connection from `utils.dbHelpers` after the session."""
+    yield
+    db.close_connections()
+
+
+@pytest.fixture(scope="session")
+def worker_app(
+    pytestconfig: pytest.Config, tmp_path_factory: pytest.TempPathFactory
+) -> Generator[Optional[str], None, None]:
+    """Run a private app-under-test for this pytest process when requested.
+
+    - `--per-worker-app`: each pytest-xdist worker copies `DB_PATH` into its own temp
+      directory, starts the app on a free port against that copy, and points
+      `utils.dbHelpers` at it.
+    - `--standin`: the app is the in-process Python stand-in (`utils/standin_server.py`)
+      instead of `app_command`; without `--per-worker-app` it serves `DB_PATH` directly
+      (creating and seeding it if it does not exist).
+
+    Yields:
+        The private app's base URL, or None when the shared app should be used.
+    """
+    per_worker = pytestconfig.getoption("per_worker_app")
+    standin = pytestconfig.getoption("standin")
+    if not (per_worker or standin):
+        yield None
+        return
+
+    from utils.app_server import AppServer  # launches the per-worker app process
+    from utils.standin_server import StandInApp, ensure_schema  # in-process stand-in app for --standin
+
+    worker_id = os.getenv("PYTEST_XDIST_WORKER", "main")
+    shared_db = db.DB_PATH
+    if standin:
+        ensure_schema(shared_db)  # only if the file is missing; an existing DB is left as is
+    app_db = db.copy_database(tmp_path_factory.mktemp(f"app-{worker_id}") / "shop.db") if per_worker else shared_db
+
+    if standin:
+        server = StandInApp(db_path=app_db)
+    else:
+        server = AppServer(
+            command=pytestconfig.getini("app_command"),
+            cwd=os.getenv("APP_DIR", pytestconfig.getini("app_dir")),
+            db_path=app_db,
+            start_timeout=float(pytestconfig.getini("app_start_timeout")),
+        )
+    url = server.start()
+    db.set_db_path(app_db)
+    print(f"[DEBUG] Worker {worker_id}: {'stand-in' if standin else 'app'} on {url}, db at {app_db}")
+    try:
+        yield url
+    finally:
+        server.stop()
+        db.set_db_path(shared_db)
+
+
+@pytest.fixture(scope="session")
+def db_snapshot(worker_app: Optional[str], tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Capture a golden copy of the database once per session (per worker).
+
+    The catalog (`items`) is kept as-is and the `cart` is emptied in the copy, so a
+    restore matches what `reset_cart()` guarantees. Depends on `worker_app` so
+    per-worker runs snapshot the worker's own copy.
+    """
+    snapshot = db.copy_database(tmp_path_factory.mktemp("db-snapshot") / "golden.db")
+    with closing(sqlite3.connect(str(snapshot))) as conn, conn:
+        conn.execute("DELETE FROM cart")
+    print(f"[DEBUG] Captured DB snapshot: {snapshot}")
+    return snapshot
+
+
+@pytest.fixture
+def clean_db(request: pytest.FixtureRequest, db_snapshot: Path) -> None:
+    """Restore the database to the session snapshot before the test runs.
+
+    A cheaper, broader alternative to `reset_cart()`: no HTTP round-trip, and both
+    `items` and `cart` come back pristine. Mark a test with
+    `@pytest.mark.dirty_tables("cart")` to restore only the tables it changes.
+    """
+    marker = request.node.get_closest_marker("dirty_tables")
+    db.restore_database(db_snapshot, tables=marker.args if marker else None)
+
+
+@pytest.fixture
+def cart_state(
+    request: pytest.FixtureRequest, worker_app: Optional[str]
+) -> Callable[..., dict[int, int]]:
+    """Return a function that puts the cart into an exact state and verifies it.
+
+    Example:
+
+        def test_something(page, cart_state):
+            cart_state({1: 10, 3: 2})           # one DELETE + executemany, in milliseconds
+            cart_state({1: 2}, via="api")        # or through POST /add-to-cart
+
+    The function returns the verified cart as `{item_id: quantity}`.
+    """
+
+    def _apply(quantities: Mapping[int, int], via: str = "db") -> dict[int, int]:
+        if via == "db":
+            db.set_cart(quantities)
+        elif via == "api":
+            from utils.api_helpers import fill_cart  # API path for cart_state(via="api")
+
+            fill_cart(request.getfixturevalue("api_request_context"), quantities)
+        else:
+            raise ValueError(f"cart_state via must be 'db' or 'api', got {via!r}")
+
+        expected = {item_id: qty for item_id, qty in quantities.items() if qty > 0}
+        actual = db.get_cart()
+        assert actual == expected, f"Cart state not applied. Expected {expected}, got {actual}"
+        return actual
+
+    return _apply
+
+
+@pytest.fixture(scope="session")
+def base_url(base_url: Optional[str], worker_app: Optional[str]) -> Optional[str]:
+    """Return the per-worker app URL when one is running, otherwise pytest-base-url's value."""
+    return worker_app or base_url
+
+
+@pytest.fixture(scope="session")
+def context_pool(
+    pytestconfig: pytest.Config, browser: Browser, browser_context_args: dict, base_url: Optional[str]
+) -> Generator[Optional[ContextPool], None, None]:
+    """One pool of reusable browser contexts per session (per xdist worker) when `--context-pool` is set.
+
+    Note: pooled contexts bypass pytest-playwright's per-context `--tracing`/`--video` artifacts
+    (`--failure-trace` works with both).
+    """
+    if not pytestconfig.getoption("context_pool"):
+        yield None
+        return
+
+    from utils.browser_pool import ContextPool  # reusable browser contexts for --context-pool
+
+    pool = ContextPool(
+        browser,
+        browser_context_args,
+        size=pytestconfig.getoption("context_pool_size"),
+        storage_state=Path(pytestconfig.getoption("storage_state")),
+        state_url=base_url,
+        prewarm_url=base_url if pytestconfig.getoption("context_pool_prewarm") else None,
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def asset_cache(pytestconfig: pytest.Config) -> Generator[Optional[AssetCache], None, None]:
+    """On-disk static asset cache shared by all UI tests when `--asset-cache` is set."""
+    if not pytestconfig.getoption("asset_cache"):
+        yield None
+        return
+
+    from utils.asset_cache import AssetCache  # on-disk static asset cache for --asset-cache
+
+    cache = AssetCache(
+        Path(pytestconfig.getoption("asset_cache_dir")),
+        max_age=pytestconfig.getoption("asset_cache_max_age"),
+    )
+    yield cache
+    print(f"[DEBUG] Asset cache: {cache.stats}")
+
+
+@pytest.fixture
+def page(
+    request: pytest.FixtureRequest, pytestconfig: pytest.Config, browser_name: str
+) -> Generator[Page, None, None]:
+    """Page for UI tests: from the context pool with `--context-pool`, otherwise pytest-playwright's default.
+
+    With `--asset-cache`, static assets for the page are served through `asset_cache`.
+
+    Without the option this matches pytest-playwright (`context.new_page()` on a fresh
+    per-test context), so artifacts like `--tracing` keep working. `browser_name` is
+    requested so pytest-playwright still parametrizes UI tests per `--browser`.
+    """
+    cache: Optional[AssetCache] = request.getfixturevalue("asset_cache")
+
+    if not pytestconfig.getoption("context_pool"):
+        new_page = request.getfixturevalue("context").new_page()
+        if cache:
+            cache.install(new_page)
+        yield new_page
+        return
+
+    pool: ContextPool = request.getfixturevalue("context_pool")
+    pooled_page = pool.acquire()
+    if cache:
+        cache.install(pooled_page)
+    yield pooled_page
+    pool.release(pooled_page)
+
+
+def _parse_budgets(lines: list[str]) -> dict[str, dict[str, float]]:
+    """Turn `navigation_budgets` lines into {page or "*": {metric: limit}}."""
+    budgets: dict[str, dict[str, float]] = {}
+    for line in lines:
+        key, _, value = line.partition("=")
+        page_name, _, metric = key.strip().rpartition(".")
+        budgets.setdefault(page_name or "*", {})[metric] = float(value)
+    return budgets
+
+
+@pytest.fixture(autouse=True)
+def navigation_metrics(request: pytest.FixtureRequest, pytestconfig: pytest.Config) -> Generator[None, None, None]:
+    """With `--nav-metrics`, record every go_home()/go_cart() page load and enforce budgets.
+
+    Records are appended as JSON lines to `<--nav-metrics-dir>/nav-<worker>.jsonl`, which
+    `pytest_configure` clears at the start of each run. A page over budget fails the test
+    at the navigation that exceeded it.
+    """
+    if not pytestconfig.getoption("nav_metrics"):
+        yield
+        return
+
+    from utils import ui_helpers  # navigation metrics recorder hook
+
+    budgets = _parse_budgets(pytestconfig.getini("navigation_budgets"))
+    out_dir = Path(pytestconfig.getoption("nav_metrics_dir"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / f"nav-{os.getenv('PYTEST_XDIST_WORKER', 'main')}.jsonl"
+
+    def _record(page_name: str, metrics: dict) -> None:
+        with open(out_file, "a") as handle:
+            handle.write(json.dumps({"test": request.node.nodeid, "page": page_name, **metrics}) + "\n")
+        limits = {**budgets.get("*", {}), **budgets.get(page_name, {})}
+        ui_helpers.assert_navigation_budget(page_name, metrics, limits)
+
+    ui_helpers.set_navigation_recorder(_record)
+    yield
+    ui_helpers.set_navigation_recorder(None)
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1 @@
+"""Project pytest plugins, registered via `pytest_plugins` in the root conftest.py."""
@@ -0,0 +1,166 @@
+# plugins/failure_trace.py
+"""Failure-only diagnostics for UI tests: keep them in memory, write them only when needed.
+
+Enable with `--failure-trace events` or `--failure-trace full` (or `FAILURE_TRACE=...`).
+For every test that uses `page`, the plugin:
+- keeps the last `--failure-trace-buffer` console messages, page errors, responses and
+  failed requests of the page's context in a ring buffer (`collections.deque`)
+- in `full` mode, also records a Playwright trace chunk (DOM snapshots + screenshots),
+  but only when the test is a retry (pytest-rerunfailures, `execution_count > 1`):
+  Playwright writes snapshots and screenshots to disk while it records, so tracing
+  every first attempt would cost I/O on tests that pass
+- when the test failed, or is a retry, writes everything to
+  `<--failure-trace-dir>/<test id>/`: `events.jsonl`, `screenshot.png` and `trace.zip`
+- otherwise drops the buffer without touching the disk
+
+Open a saved trace with `playwright show-trace <dir>/trace.zip`.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import json  # events.jsonl
+import os  # env default
+import re  # safe folder names from node ids
+import time  # event timestamps
+import weakref  # contexts that already have tracing started
+from collections import deque  # bounded event buffer
+from pathlib import Path  # robust path handling
+from typing import TYPE_CHECKING, Any, Callable, Generator, Optional
+
+import pytest  # hooks + fixtures
+
+# Third‑party: Playwright, imported where it is used so runs without `page` don't load it
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Page
+
+# Reports of the phases that ran so far, per test (set by pytest_runtest_makereport).
+_REPORTS = pytest.StashKey[dict[str, pytest.TestReport]]()
+
+# Contexts with `tracing.start()` already called. Pooled contexts live for the whole
+# session, so tracing is started once and each test records its own chunk.
+_tracing_contexts: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("failure-trace", "Failure-only UI diagnostics")
+    group.addoption(
+        "--failure-trace",
+        choices=("events", "full"),
+        default=os.getenv("FAILURE_TRACE") or None,
+        help="Buffer console/network events ('events'), plus a Playwright trace of retries ('full'); save them only on failure or retry.",
+    )
+    group.addoption(
+        "--failure-trace-dir",
+        default="test-results",
+        help="Where failing tests' diagnostics are written (default test-results).",
+    )
+    group.addoption(
+        "--failure-trace-buffer",
+        type=int,
+        default=500,
+        help="Events kept per test; older ones are dropped (default 500).",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo[None]):
+    outcome = yield
+    report: pytest.TestReport = outcome.get_result()
+    item.stash.setdefault(_REPORTS, {})[report.when] = report
+
+
+class _Recorder:
+    """Ring buffer of one test's context events, plus an optional trace chunk."""
+
+    def __init__(self, context: BrowserContext, maxlen: int, trace: bool) -> None:
+        self.context = context
+        self.trace = trace
+        self.events: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self.dropped = 0
+        self._t0 = time.monotonic()
+        self._handlers: list[tuple[str, Callable[[Any], None]]] = [
+            ("console", lambda msg: self._add("console", level=msg.type, text=msg.text, location=msg.location)),
+            ("weberror", lambda err: self._add("pageerror", text=str(err.error))),
+            ("response", lambda r: self._add("response", method=r.request.method, url=r.url, status=r.status)),
+            ("requestfailed", lambda r: self._add("requestfailed", method=r.method, url=r.url, error=r.failure)),
+        ]
+
+    def _add(self, kind: str, **fields: Any) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append({"t_ms": round((time.monotonic() - self._t0) * 1000, 1), "kind": kind, **fields})
+
+    def start(self, title: str) -> None:
+        for event, handler in self._handlers:
+            self.context.on(event, handler)
+        if self.trace:
+            if self.context not in _tracing_contexts:
+                self.context.tracing.start(screenshots=True, snapshots=True)
+                _tracing_contexts.add(self.context)
+            self.context.tracing.start_chunk(title=title)
+
+    def stop(self, page: Page, out: Optional[Path]) -> None:
+        """Detach from the context; write diagnostics to `out`, or discard them if None."""
+        from playwright.sync_api import Error  # screenshot of a crashed page
+        for event, handler in self._handlers:
+            self.context.remove_listener(event, handler)
+        if out is None:
+            if self.trace:
+                self.context.tracing.stop_chunk()  # no path: the chunk is discarded
+            return
+
+        out.mkdir(parents=True, exist_ok=True)
+        with open(out / "events.jsonl", "w") as handle:
+            if self.dropped:
+                handle.write(json.dumps({"kind": "dropped", "count": self.dropped}) + "\n")
+            for event in self.events:
+                handle.write(json.dumps(event, default=str) + "\n")
+        try:
+            if not page.is_closed():
+                page.screenshot(path=str(out / "screenshot.png"), full_page=True)
+        except Error:
+            pass  # page crashed or navigated away mid-screenshot; events are still saved
+        if self.trace:
+            self.context.tracing.stop_chunk(path=str(out / "trace.zip"))
+
+
+def _should_keep(item: pytest.Item) -> bool:
+    """True if setup or the test body failed, or this run is a retry of an earlier failure."""
+    reports = item.stash.get(_REPORTS, {})
+    return any(r.failed for r in reports.values()) or getattr(item, "execution_count", 1) > 1
+
+
+@pytest.fixture(autouse=True)
+def failure_trace(request: pytest.FixtureRequest, pytestconfig: pytest.Config) -> Generator[None, None, None]:
+    """Record diagnostics for tests that use `page` when `--failure-trace` is set (see module docstring)."""
+    mode = pytestconfig.getoption("failure_trace")
+    if not mode or "page" not in request.fixturenames:
+        yield
+        return
+
+    from playwright.sync_api import Error  # context closed before the diagnostics were saved
+
+    page: Page = request.getfixturevalue("page")
+    # Trace retries only (see module docstring). pytest-playwright's own --tracing already
+    # records this context; don't start a second trace.
+    retry = getattr(request.node, "execution_count", 1) > 1
+    trace = mode == "full" and retry and pytestconfig.getoption("tracing", "off") == "off"
+    recorder = _Recorder(page.context, pytestconfig.getoption("failure_trace_buffer"), trace)
+    recorder.start(title=request.node.nodeid)
+    yield
+
+    item = request.node
+    out = None
+    if _should_keep(item):
+        name = re.sub(r"[^\w.-]+", "-", item.nodeid).strip("-")
+        attempt = getattr(item, "execution_count", 1)
+        out = Path(pytestconfig.getoption("failure_trace_dir")) / (name if attempt == 1 else f"{name}-attempt{attempt}")
+    try:
+        recorder.stop(page, out)
+    except Error as exc:
+        print(f"[DEBUG] Could not save failure diagnostics for {item.nodeid}: {exc}")
+        return
+    if out is not None:
+        item.user_properties.append(("failure_trace", str(out)))
+        print(f"[DEBUG] Failure diagnostics saved to {out}")
@@ -0,0 +1,276 @@
+# plugins/impact_map.py
+"""Change-impact test selection: which tests touch which endpoints and tables?
+
+Recording (`--record-impact`, or `RECORD_IMPACT=1`) notes, for every test, the
+app endpoints and SQLite tables it touched, including in its fixtures:
+- endpoints: requests sent through Playwright's sync and async `APIRequestContext`
+  (so `utils/api_helpers.py` / `async_api_helpers.py`), `Page.goto`, and documents /
+  XHR / fetch requests a `page` makes to the app's origin (e.g. the add-to-cart call)
+- tables: tables named in statements run through `utils.dbHelpers` (via `add_query_listener`),
+  tables read from the helpers' in-memory caches (`CACHED_READERS`, e.g. the catalog, which
+  would otherwise only be recorded for whichever test happened to load it first), and
+  tables named in `uses_index` markers
+
+At session end the entries of the tests that ran are merged into `--impact-map`
+(default `build/impact-map.json`).
+
+Selection (`--impacted-by /add-to-cart,cart`) keeps only the tests whose recorded
+endpoints or tables include one of the targets, plus every test missing from the map
+(never recorded, so its impact is unknown). A table target also selects the endpoints
+mapped to it by the `impact_endpoint_tables` ini option, since the app reads and writes
+those tables behind the endpoint.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import functools  # preserve wrapped function metadata
+import importlib  # look up Playwright classes by name
+import json  # impact map file
+import os  # env default
+import re  # table names in SQL
+from collections import defaultdict  # per-test touched sets
+from pathlib import Path  # robust path handling
+from typing import Any, Callable, Generator, Optional
+from urllib.parse import urlparse  # endpoint paths
+
+import pytest  # hooks + fixtures
+
+# Local: statements run by the DB helpers
+from utils import dbHelpers as db
+
+# Request methods whose first argument is the URL: (module, class, methods).
+REQUEST_METHODS = [
+    ("playwright.sync_api", "APIRequestContext", ("fetch", "get", "post", "put", "patch", "delete", "head")),
+    ("playwright.async_api", "APIRequestContext", ("fetch", "get", "post", "put", "patch", "delete", "head")),
+    ("playwright.sync_api", "Page", ("goto",)),
+]
+
+# DB helpers that can answer from a cache without running a query: (function, tables it reads).
+CACHED_READERS = [("get_catalog", ("items",))]
+
+# Page-initiated requests that reach app routes (static assets are skipped).
+PAGE_RESOURCE_TYPES = {"document", "xhr", "fetch"}
+
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+["`\[]?([A-Za-z_]\w*)', re.IGNORECASE)
+
+# What the running test touched: {nodeid: {"endpoints": set, "tables": set}}
+_touched: dict[str, dict[str, set[str]]] = defaultdict(lambda: {"endpoints": set(), "tables": set()})
+# Entries reported by the tests of this run (controller side; via reports under xdist).
+_collected: dict[str, dict[str, list[str]]] = {}
+_current: dict[str, Optional[str]] = {"nodeid": None}
+_restore: list[tuple[Any, str, Any]] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("impact", "Change-impact test selection")
+    group.addoption(
+        "--record-impact",
+        action="store_true",
+        default=os.getenv("RECORD_IMPACT", "").lower() in ("1", "true", "yes"),
+        help="Record the endpoints and tables each test touches into --impact-map.",
+    )
+    group.addoption(
+        "--impacted-by",
+        metavar="TARGETS",
+        default=None,
+        help="Comma-separated endpoints/tables (e.g. /add-to-cart,cart); run only tests that touch them.",
+    )
+    group.addoption(
+        "--impact-map",
+        default=os.getenv("IMPACT_MAP", "build/impact-map.json"),
+        help="JSON map of test -> endpoints/tables (default build/impact-map.json).",
+    )
+    parser.addini(
+        "impact_endpoint_tables",
+        type="linelist",
+        default=[],
+        help="`/endpoint = table, table` lines: tables the app touches behind each endpoint.",
+    )
+
+
+def endpoint_of(url: str) -> str:
+    """Path part of an absolute or relative URL ("/add-to-cart?x=1" -> "/add-to-cart")."""
+    return urlparse(url).path or "/"
+
+
+def tables_in(query: str) -> set[str]:
+    """Tables named in a SQL statement (sqlite_* internals excluded)."""
+    return {t.lower() for t in _TABLE_RE.findall(query) if not t.lower().startswith("sqlite_")}
+
+
+def _note(kind: str, value: str) -> None:
+    nodeid = _current["nodeid"]
+    if nodeid is not None:
+        _touched[nodeid][kind].add(value)
+
+
+def _on_query(query: str, params: Any, seconds: float) -> None:
+    for table in tables_in(query):
+        _note("tables", table)
+
+
+def _recording(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a request method so its URL is noted for the running test (works for async methods too)."""
+
+    @functools.wraps(func)
+    def wrapper(self: Any, url_or_request: Any, *args: Any, **kwargs: Any) -> Any:
+        url = url_or_request if isinstance(url_or_request, str) else getattr(url_or_request, "url", "")
+        if url:
+            _note("endpoints", endpoint_of(url))
+        return func(self, url_or_request, *args, **kwargs)  # a coroutine for the async client
+
+    wrapper.__impact_recorded__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _reading(func: Callable[..., Any], tables: tuple[str, ...]) -> Callable[..., Any]:
+    """Wrap a cached DB reader so its tables are noted whether or not it ran a query."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        for table in tables:
+            _note("tables", table)
+        return func(*args, **kwargs)
+
+    wrapper.__impact_recorded__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not config.getoption("record_impact"):
+        return
+    for module_name, class_name, methods in REQUEST_METHODS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for method in methods:
+            original = getattr(cls, method)
+            if getattr(original, "__impact_recorded__", False):
+                continue
+            _restore.append((cls, method, original))
+            setattr(cls, method, _recording(original))
+    for name, tables in CACHED_READERS:
+        original = getattr(db, name)
+        if not getattr(original, "__impact_recorded__", False):
+            _restore.append((db, name, original))
+            setattr(db, name, _reading(original, tables))
+    db.add_query_listener(_on_query)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    db.remove_query_listener(_on_query)
+    while _restore:
+        owner, attr, original = _restore.pop()
+        setattr(owner, attr, original)
+    _touched.clear()
+    _collected.clear()
+
+
+@pytest.fixture(autouse=True)
+def impact_page_requests(request: pytest.FixtureRequest, pytestconfig: pytest.Config) -> Generator[None, None, None]:
+    """With `--record-impact`, note the app routes a test's `page` requests (clicks, form posts, fetches)."""
+    if not pytestconfig.getoption("record_impact") or "page" not in request.fixturenames:
+        yield
+        return
+    page = request.getfixturevalue("page")
+    base_url = request.getfixturevalue("base_url")
+    app_host = urlparse(base_url).netloc if base_url else None
+
+    def on_request(req: Any) -> None:
+        parsed = urlparse(req.url)
+        if req.resource_type in PAGE_RESOURCE_TYPES and (app_host is None or parsed.netloc == app_host):
+            _note("endpoints", parsed.path or "/")
+
+    page.context.on("request", on_request)
+    yield
+    page.context.remove_listener("request", on_request)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: Optional[pytest.Item]):
+    if item.config.getoption("record_impact"):
+        _current["nodeid"] = item.nodeid
+    yield
+    _current["nodeid"] = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo[None]):
+    outcome = yield
+    report: pytest.TestReport = outcome.get_result()
+    if report.when == "teardown" and item.config.getoption("record_impact"):
+        touched = _touched.pop(item.nodeid, {"endpoints": set(), "tables": set()})
+        for marker in item.iter_markers("uses_index"):  # plan checks read the table without running the query
+            touched["tables"] |= tables_in(marker.args[0])
+        report.user_properties.append(("impact", {k: sorted(v) for k, v in touched.items()}))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    # Runs on the controller too, with the reports of xdist workers.
+    if report.when == "teardown":
+        for name, value in report.user_properties:
+            if name == "impact":
+                _collected[report.nodeid] = value
+
+
+def load_map(path: Path) -> dict[str, dict[str, list[str]]]:
+    """Read `{nodeid: {"endpoints": [...], "tables": [...]}}` ({} if missing or unreadable)."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if hasattr(config, "workerinput") or not _collected:
+        return  # the xdist controller (or single process) writes the map for everyone
+    path = Path(config.getoption("impact_map"))
+    impact = load_map(path)
+    impact.update(_collected)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(impact.items())), indent=1) + "\n")
+
+
+def _parse_endpoint_tables(lines: list[str]) -> dict[str, set[str]]:
+    """Turn `impact_endpoint_tables` lines into {table: {endpoint, ...}}."""
+    endpoints_by_table: dict[str, set[str]] = defaultdict(set)
+    for line in lines:
+        endpoint, _, tables = line.partition("=")
+        for table in tables.split(","):
+            if table.strip():
+                endpoints_by_table[table.strip().lower()].add(endpoint.strip())
+    return endpoints_by_table
+
+
+def is_impacted(entry: Optional[dict[str, list[str]]], targets: set[str]) -> bool:
+    """True if the test touched any target, or was never recorded."""
+    if entry is None:
+        return True
+    return bool(targets & (set(entry.get("endpoints", ())) | set(entry.get("tables", ()))))
+
+
+@pytest.hookimpl(trylast=True)  # after -m/-k deselection; before sharding splits what is left
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    raw = config.getoption("impacted_by")
+    if not raw:
+        return
+    targets = {t.strip() if t.strip().startswith("/") else t.strip().lower() for t in raw.split(",") if t.strip()}
+    endpoints_by_table = _parse_endpoint_tables(config.getini("impact_endpoint_tables"))
+    for target in list(targets):
+        targets |= endpoints_by_table.get(target, set())
+
+    impact = load_map(Path(config.getoption("impact_map")))
+    if not impact:
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning(
+                f"--impacted-by: no impact map at {config.getoption('impact_map')}; running all tests "
+                "(record one with --record-impact)"
+            ),
+            stacklevel=2,
+        )
+        return
+    kept = [item for item in items if is_impacted(impact.get(item.nodeid), targets)]
+    deselected = [item for item in items if not is_impacted(impact.get(item.nodeid), targets)]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = kept
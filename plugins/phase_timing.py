@@ -0,0 +1,268 @@
+# plugins/phase_timing.py
+"""Per-test phase timing: where did the time go — API, DB, UI helpers or navigation?
+
+Enable with `--phase-timings DIR` (or `PHASE_TIMINGS_DIR=DIR`). The plugin then:
+- wraps the API, DB and UI entry-point helpers listed in `HELPER_FUNCTIONS`, plus
+  Playwright's `Page` navigation and `APIRequestContext` request methods, with a
+  `perf_counter` timer
+- attributes each call to the running test and phase (setup / call / teardown)
+- streams every call to `timeline-<worker>.csv` in DIR as it happens
+- keeps only per-test aggregates (calls, total, max per helper) in memory and
+  writes them to `timeline-<worker>.json` at session end
+- prints a "slowest helpers" table in the terminal summary
+
+A helper called from another helper of the same category (e.g. `wait_for_cart_quantity`
+polling `get_cart_quantity`) is only recorded once, as the outer call; navigation
+triggered by a UI helper is still recorded under `navigation` as well.
+
+Overhead is two `perf_counter()` calls, one buffered CSV row and a dict update per
+wrapped call, so it is cheap enough to leave on in CI.
+
+Note: names imported with `from utils.x import name` before the plugin configures
+(i.e. by conftest.py itself) keep the unwrapped function; test modules are imported
+later and see the timed versions.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import csv  # timeline export
+import functools  # preserve wrapped function metadata
+import importlib  # look up helper modules by name
+import json  # timeline export
+import os  # env default + worker id
+import time  # perf_counter
+from collections import defaultdict  # summary aggregation
+from pathlib import Path  # robust path handling
+from typing import Any, Callable, Optional
+
+import pytest  # hooks
+
+# Helpers to instrument: {module: (category, function names)}. Only entry points tests call
+# directly; plumbing such as `get_connection`, `data_version` or `get_catalog` runs inside
+# them and would only double-count. `iter_rows` is left out because it is a generator:
+# the call returns before any row is read.
+HELPER_FUNCTIONS = {
+    "utils.api_helpers": ("api", ("reset_cart", "add_to_cart", "fill_cart")),
+    "utils.async_api_helpers": ("api", ("run_with_api_context", "run_add_to_cart_many")),
+    "utils.dbHelpers": ("db", (
+        "fetch_one", "fetch_all", "execute_many", "bulk_insert", "execute_query", "reset_table",
+        "copy_database", "restore_database", "get_item_name", "get_item_id", "get_item_ids",
+        "get_cart_quantity", "get_cart", "set_cart", "wait_for_row", "wait_for_cart_quantity",
+        "explain_query_plan", "assert_uses_index",
+    )),
+    "utils.ui_helpers": ("ui", (
+        "go_home", "go_cart", "read_page_state", "expect_page_state", "expect_text_visible",
+        "get_cart_count", "expect_cart_count",
+    )),
+}
+
+# Playwright methods to instrument: (module, class, methods, category).
+PLAYWRIGHT_METHODS = [
+    ("playwright.sync_api", "Page", ("goto", "reload", "go_back", "go_forward", "wait_for_url", "wait_for_load_state"), "navigation"),
+    ("playwright.sync_api", "APIRequestContext", ("fetch", "get", "post", "put", "delete"), "api"),
+]
+
+SUMMARY_ROWS = 15
+
+EVENT_FIELDS = ("nodeid", "phase", "category", "name", "start_s", "duration_s")
+
+# Per-test phase durations: {nodeid: {phase: seconds}}
+_phases: dict[str, dict[str, float]] = defaultdict(dict)
+# Per-test helper aggregates: {nodeid: {(phase, category, name): [calls, total s, max s]}}
+_helpers: dict[str, dict[tuple[str, str, str], list[float]]] = defaultdict(dict)
+# Wrapped calls currently running per category (nested same-category calls are not recorded).
+_active: dict[str, int] = defaultdict(int)
+_current = {"nodeid": "<session>", "phase": "setup"}
+_t0 = time.perf_counter()
+_restore: list[tuple[Any, str, Any]] = []
+# Raw event stream: {"path": Path, "handle": file | None, "writer": csv writer | None}
+_stream: dict[str, Any] = {"path": None, "handle": None, "writer": None}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("phase-timings", "Per-test phase timing")
+    group.addoption(
+        "--phase-timings",
+        metavar="DIR",
+        default=os.getenv("PHASE_TIMINGS_DIR") or None,
+        help="Time helper calls and navigation per test phase; write timeline JSON/CSV to DIR.",
+    )
+
+
+def _timed(func: Callable[..., Any], category: str, name: str) -> Callable[..., Any]:
+    """Wrap `func` so each call is recorded against the current test and phase."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _active[category]:
+            return func(*args, **kwargs)
+        _active[category] += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            _active[category] -= 1
+            _record(category, name, started - _t0, duration)
+
+    wrapper.__phase_timed__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _record(category: str, name: str, start: float, duration: float) -> None:
+    """Add one call to the current test's aggregates and append it to the event stream."""
+    nodeid, phase = _current["nodeid"], _current["phase"]
+    row = _helpers[nodeid].get((phase, category, name))
+    if row is None:
+        _helpers[nodeid][(phase, category, name)] = [1, duration, duration]
+    else:
+        row[0] += 1
+        row[1] += duration
+        row[2] = max(row[2], duration)
+
+    if _stream["writer"] is None:
+        if _stream["path"] is None:
+            return  # not configured (plugin imported but disabled)
+        _stream["handle"] = open(_stream["path"], "w", newline="")
+        _stream["writer"] = csv.writer(_stream["handle"])
+        _stream["writer"].writerow(EVENT_FIELDS)
+    _stream["writer"].writerow((nodeid, phase, category, name, round(start, 6), round(duration, 6)))
+
+
+def _close_stream() -> None:
+    if _stream["handle"] is not None:
+        _stream["handle"].close()
+    _stream.update(path=None, handle=None, writer=None)
+
+
+def _patch(owner: Any, attr: str, category: str, name: str) -> None:
+    original = getattr(owner, attr)
+    if getattr(original, "__phase_timed__", False):
+        return
+    _restore.append((owner, attr, original))
+    setattr(owner, attr, _timed(original, category, name))
+
+
+def _instrument() -> None:
+    for module_name, (category, names) in HELPER_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        short = module_name.rsplit(".", 1)[-1]
+        for attr in names:
+            _patch(module, attr, category, f"{short}.{attr}")
+
+    for module_name, class_name, methods, category in PLAYWRIGHT_METHODS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for method in methods:
+            _patch(cls, method, category, f"{class_name}.{method}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    out_dir = config.getoption("phase_timings")
+    if not out_dir:
+        return
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    if not hasattr(config, "workerinput"):
+        # Controller / single process: drop timelines from a previous run.
+        for old in out.glob("timeline-*.*"):
+            old.unlink()
+    # Opened on the first recorded call, so an xdist controller leaves no empty file behind.
+    _stream["path"] = out / f"timeline-{_worker_id(config)}.csv"
+    _instrument()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    while _restore:
+        owner, attr, original = _restore.pop()
+        setattr(owner, attr, original)
+    _close_stream()
+
+
+def _track(item: pytest.Item, phase: str):
+    _current["nodeid"], _current["phase"] = item.nodeid, phase
+    started = time.perf_counter()
+    yield
+    _phases[item.nodeid][phase] = time.perf_counter() - started
+    _current["nodeid"], _current["phase"] = "<session>", "teardown"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item: pytest.Item):
+    yield from _track(item, "setup")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    yield from _track(item, "call")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: pytest.Item):
+    yield from _track(item, "teardown")
+
+
+def _worker_id(config: pytest.Config) -> str:
+    return getattr(config, "workerinput", {}).get("workerid", "main")
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    out_dir = session.config.getoption("phase_timings")
+    if not out_dir or not _phases:
+        return  # disabled, or an xdist controller that ran no tests itself
+    _close_stream()
+    worker = _worker_id(session.config)
+    tests = {
+        nodeid: {
+            "phases": {k: round(v, 6) for k, v in _phases[nodeid].items()},
+            "helpers": [
+                {"phase": phase, "category": category, "name": name,
+                 "calls": calls, "total_s": round(total, 6), "max_s": round(longest, 6)}
+                for (phase, category, name), (calls, total, longest) in _helpers.get(nodeid, {}).items()
+            ],
+        }
+        for nodeid in _phases
+    }
+    (Path(out_dir) / f"timeline-{worker}.json").write_text(json.dumps({"worker": worker, "tests": tests}, indent=1))
+
+
+def summarize(out: Path) -> tuple[list[tuple[str, str, int, float, float]], dict[tuple[str, str], float]]:
+    """Aggregate the per-test helper totals of every worker timeline in `out`.
+
+    Returns:
+        (rows, by_category): rows are (name, category, calls, total s, max s) sorted by
+        total time; by_category maps (phase, category) to total seconds.
+    """
+    totals: dict[str, list[Any]] = {}
+    by_category: dict[tuple[str, str], float] = defaultdict(float)
+    for path in out.glob("timeline-*.json"):
+        for test in json.loads(path.read_text())["tests"].values():
+            for helper in test["helpers"]:
+                row = totals.setdefault(helper["name"], [helper["category"], 0, 0.0, 0.0])
+                row[1] += helper["calls"]
+                row[2] += helper["total_s"]
+                row[3] = max(row[3], helper["max_s"])
+                by_category[(helper["phase"], helper["category"])] += helper["total_s"]
+    rows = sorted(((name, *vals) for name, vals in totals.items()), key=lambda r: r[3], reverse=True)
+    return rows, dict(by_category)
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    out_dir: Optional[str] = config.getoption("phase_timings")
+    if not out_dir or hasattr(config, "workerinput"):
+        return
+    rows, by_category = summarize(Path(out_dir))
+    if not rows:
+        return
+    tr = terminalreporter
+    tr.write_sep("=", "slowest helpers (phase timings)")
+    tr.write_line(f"{'helper':<40} {'category':<10} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9}")
+    for name, category, calls, total, longest in rows[:SUMMARY_ROWS]:
+        tr.write_line(
+            f"{name:<40} {category:<10} {calls:>6} {total * 1000:>10.1f} {total / calls * 1000:>9.1f} {longest * 1000:>9.1f}"
+        )
+    tr.write_line("")
+    tr.write_line("time by phase/category (ui includes the navigation it triggers):")
+    for (phase, category), total in sorted(by_category.items()):
+        tr.write_line(f"  {phase:<9} {category:<10} {total * 1000:>10.1f} ms")
+    tr.write_line(f"timelines: {Path(out_dir).resolve()}")
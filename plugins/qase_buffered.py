@@ -0,0 +1,339 @@
+# plugins/qase_buffered.py
+"""Non-blocking Qase TestOps reporting (opt-in with `--qase-buffered`).
+
+In `testops` mode, qase-pytest talks to the API while tests run: it checks the
+project and creates the run before the first test, then sends batches as they fill.
+A slow or unreachable endpoint therefore adds wall-clock time to the run itself.
+
+With `--qase-buffered` (or `QASE_BUFFERED=1`):
+- qase-pytest is switched to `report` mode, so it only writes its local report
+  (`build/qase-report/`); that report is the fallback if the upload fails
+- each test result is put on an in-memory queue; `put` never blocks
+- a background thread creates the run on first use and posts results to
+  `/v1/result/<project>/<run>/bulk` in batches, retrying each request a bounded
+  number of times with exponential backoff
+- if the endpoint stays unreachable (or rejects the token), the thread stops calling
+  it and appends every remaining result to `--qase-spill` (JSON lines)
+- at session end the thread gets `--qase-flush-timeout` seconds to drain the queue;
+  leftovers are spilled as well
+
+Project, run title/description and `complete` come from `qase.config.json`; the token
+from `QASE_TESTOPS_API_TOKEN`. `--qase-endpoint` (default https://api.qase.io) can
+point at a local stand-in for testing. Under pytest-xdist only the controller
+reports, so a run gets one Qase run no matter how many workers there are.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import json  # API payloads + spill file
+import os  # env defaults
+import queue  # in-memory result queue
+import threading  # background flusher
+import time  # backoff
+import urllib.error  # transport/HTTP errors
+from pathlib import Path  # robust path handling
+from typing import Any, Optional
+
+import pytest  # hooks
+
+DEFAULT_ENDPOINT = "https://api.qase.io"
+CONFIG_FILE = "qase.config.json"
+
+# HTTP statuses worth retrying; any other 4xx means the request itself is wrong.
+_RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+_CLOSE = object()  # queue sentinel: drain and stop
+
+# The session's reporter (controller / single process only), set in pytest_configure.
+_reporter: Optional["BufferedQaseReporter"] = None
+
+
+class DeliveryError(Exception):
+    """A request to the Qase API failed (after retries, if it was retryable)."""
+
+
+class BufferedQaseReporter:
+    """Queue results in memory and deliver them to the Qase API from a background thread.
+
+    Args:
+        endpoint: API base URL, e.g. "https://api.qase.io".
+        token: Qase API token. Optional; without it nothing is sent and results are spilled.
+        project: Qase project code.
+        spill_path: JSON-lines file for results that could not be delivered.
+        run_title: Title for the run created on first delivery.
+        run_description: Description for that run. Optional.
+        run_id: Report into this existing run instead of creating one. Optional.
+        complete: Mark the run complete at close (only if every result was delivered).
+        batch_size: Maximum results per bulk request.
+        flush_interval: Seconds to wait for more results before sending a partial batch.
+        retries: Attempts per request before giving up on the endpoint.
+        backoff: Seconds before the first retry; doubled after each attempt.
+        timeout: Socket timeout per request, in seconds.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        token: Optional[str],
+        project: str,
+        spill_path: Path,
+        run_title: str = "Automated run",
+        run_description: str = "",
+        run_id: Optional[int] = None,
+        complete: bool = True,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10.0,
+    ) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.token = token
+        self.project = project
+        self.spill_path = Path(spill_path)
+        self.run_title = run_title
+        self.run_description = run_description
+        self.run_id = run_id
+        self.complete = complete
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = {"queued": 0, "sent": 0, "spilled": 0, "batches": 0, "requests": 0}
+        self.error: Optional[str] = None if token else "no API token"
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._lock = threading.Lock()  # stats and the spill file are shared with the sender thread
+        self._thread = threading.Thread(target=self._run, name="qase-buffered", daemon=True)
+        self._thread.start()
+
+    # -- producer side (test thread) ------------------------------------------
+    def add(self, result: dict[str, Any]) -> None:
+        """Queue one result payload; never blocks."""
+        self.stats["queued"] += 1
+        self._queue.put_nowait(result)
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Flush what is queued (waiting at most `timeout` seconds), spill the rest, complete the run.
+
+        If the sender is still busy after `timeout`, the run is left open: the batch it is
+        delivering may still land or be spilled, so the run cannot be known to be complete.
+        """
+        self._queue.put_nowait(_CLOSE)
+        self._thread.join(timeout)
+        stalled = self._thread.is_alive()
+        if stalled:  # set first, so anything the sender picks up next is spilled, not sent
+            self.error = self.error or f"flush timed out after {timeout}s; a batch was still being delivered"
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _CLOSE:
+                leftovers.append(item)
+        if leftovers:
+            self.error = self.error or f"flush timed out after {timeout}s"
+            self._spill(leftovers)
+        if stalled:
+            self._queue.put_nowait(_CLOSE)  # drained above; lets the sender exit after its batch
+            return
+        if self.complete and self.run_id and not self.error and not self.stats["spilled"]:
+            try:
+                self._request(f"/v1/run/{self.project}/{self.run_id}/complete", {})
+            except DeliveryError as exc:
+                self.error = f"could not complete run {self.run_id}: {exc}"
+
+    # -- consumer side (background thread) ------------------------------------
+    def _run(self) -> None:
+        closing = False
+        while not closing:
+            # Block for the first result, then collect more for up to `flush_interval`.
+            batch: list[dict[str, Any]] = []
+            deadline: Optional[float] = None
+            while len(batch) < self.batch_size:
+                wait = None if deadline is None else deadline - time.monotonic()
+                if wait is not None and wait <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=wait)
+                except queue.Empty:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+                deadline = deadline or time.monotonic() + self.flush_interval
+            if batch:
+                self._deliver(batch)
+
+    def _deliver(self, batch: list[dict[str, Any]]) -> None:
+        if self.error:
+            self._spill(batch)  # endpoint already given up on: fall back straight away
+            return
+        try:
+            if self.run_id is None:
+                created = self._request(
+                    f"/v1/run/{self.project}",
+                    {"title": self.run_title, "description": self.run_description, "is_autotest": True},
+                )
+                self.run_id = int(created["result"]["id"])
+            self._request(f"/v1/result/{self.project}/{self.run_id}/bulk", {"results": batch})
+        except DeliveryError as exc:
+            self.error = str(exc)
+            self._spill(batch)
+            return
+        with self._lock:
+            self.stats["sent"] += len(batch)
+            self.stats["batches"] += 1
+
+    def _request(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """POST JSON with bounded retries; return the decoded response body."""
+        import urllib.request  # stdlib HTTP client; deferred so runs without --qase-buffered don't load it
+
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "Accept": "application/json", "Token": self.token or ""}
+        delay = self.backoff
+        for attempt in range(1, self.retries + 1):
+            self.stats["requests"] += 1
+            request = urllib.request.Request(self.endpoint + path, data=body, headers=headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read() or b"{}")
+            except urllib.error.HTTPError as exc:
+                if exc.code not in _RETRYABLE_STATUSES or attempt == self.retries:
+                    raise DeliveryError(f"POST {path} returned {exc.code}") from None
+            except (urllib.error.URLError, OSError, ValueError) as exc:
+                if attempt == self.retries:
+                    raise DeliveryError(f"POST {path} failed after {attempt} attempts: {exc}") from None
+            time.sleep(delay)
+            delay *= 2
+        raise DeliveryError(f"POST {path} failed")  # unreachable; keeps type checkers happy
+
+    def _spill(self, results: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, "a") as handle:
+                for result in results:
+                    handle.write(json.dumps({"project": self.project, "run_id": self.run_id, "result": result}) + "\n")
+            self.stats["spilled"] += len(results)
+
+
+def result_payload(report: pytest.TestReport) -> dict[str, Any]:
+    """Turn a pytest report into a Qase bulk-result payload (cases are matched by title and suite)."""
+    path, _, name = report.nodeid.partition("::")
+    suite = " / ".join(Path(path).with_suffix("").parts)
+    if report.passed:
+        status = "passed"
+    elif report.skipped:
+        status = "skipped"
+    else:
+        status = "failed"
+    payload: dict[str, Any] = {
+        "case": {"title": name or path, "suite_title": suite},
+        "status": status,
+        "time_ms": int(report.duration * 1000),
+    }
+    if report.failed and report.longreprtext.strip():
+        payload["stacktrace"] = report.longreprtext
+        payload["comment"] = report.longreprtext.strip().splitlines()[-1][:500]
+    return payload
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("qase-buffered", "Non-blocking Qase reporting")
+    group.addoption(
+        "--qase-buffered",
+        action="store_true",
+        default=os.getenv("QASE_BUFFERED", "").lower() in ("1", "true", "yes"),
+        help="Queue results and upload them to Qase from a background thread.",
+    )
+    group.addoption(
+        "--qase-endpoint",
+        default=os.getenv("QASE_ENDPOINT", DEFAULT_ENDPOINT),
+        help=f"Qase API base URL (default {DEFAULT_ENDPOINT}).",
+    )
+    group.addoption(
+        "--qase-spill",
+        default="build/qase-buffer/pending.jsonl",
+        help="JSON-lines file for results that could not be uploaded.",
+    )
+    group.addoption("--qase-batch-size", type=int, default=100, help="Results per bulk request (default 100).")
+    group.addoption("--qase-retries", type=int, default=3, help="Attempts per request (default 3).")
+    group.addoption(
+        "--qase-flush-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait at session end for queued results (default 30).",
+    )
+
+
+def _load_qase_config(rootdir: Path) -> dict[str, Any]:
+    path = rootdir / CONFIG_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    global _reporter
+    if not config.getoption("qase_buffered", False):
+        return
+    # qase-pytest keeps building its local report, but never touches the network.
+    config.option.qase_mode = "report"
+    if hasattr(config, "workerinput") or config.option.collectonly:
+        return  # xdist workers hand their reports to the controller, which uploads them
+
+    spill_path = Path(config.getoption("qase_spill"))
+    spill_path.unlink(missing_ok=True)  # results spilled by a previous run
+    testops = _load_qase_config(Path(config.rootpath)).get("testops", {})
+    run = testops.get("run", {})
+    token = os.path.expandvars(testops.get("api", {}).get("token", ""))
+    if not token or token.startswith("$"):
+        token = os.getenv("QASE_TESTOPS_API_TOKEN") or None
+    run_title = run.get("title", "Automated run")
+    if config.getoption("shard", None):
+        run_title += f" (shard {config.getoption('shard')})"  # one Qase run per CI shard
+    _reporter = BufferedQaseReporter(
+        endpoint=config.getoption("qase_endpoint"),
+        token=token,
+        project=testops.get("project", ""),
+        spill_path=spill_path,
+        run_title=run_title,
+        run_description=run.get("description", ""),
+        run_id=int(run["id"]) if run.get("id") else None,
+        complete=bool(run.get("complete", True)),
+        batch_size=config.getoption("qase_batch_size"),
+        retries=config.getoption("qase_retries"),
+    )
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if _reporter is None:
+        return
+    # One result per test: the call phase, or setup when it failed/skipped before the call.
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        _reporter.add(result_payload(report))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if _reporter is not None:
+        _reporter.close(timeout=session.config.getoption("qase_flush_timeout"))
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    global _reporter
+    _reporter = None
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    if _reporter is None:
+        return
+    stats = _reporter.stats
+    tr = terminalreporter
+    tr.write_sep("=", "qase (buffered)")
+    tr.write_line(f"{stats['sent']} of {stats['queued']} results sent in {stats['batches']} batches "
+                  f"({stats['requests']} requests), run {_reporter.run_id}")
+    if stats["spilled"] or _reporter.error:
+        tr.write_line(f"not delivered: {_reporter.error}; {stats['spilled']} results spilled to "
+                      f"{_reporter.spill_path} (qase-pytest's local report is in build/qase-report)")
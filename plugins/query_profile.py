@@ -0,0 +1,146 @@
+# plugins/query_profile.py
+"""SQL query profiling and index checks for `utils.dbHelpers`.
+
+Enable profiling with `--query-profile DIR` (or `QUERY_PROFILE_DIR=DIR`). The plugin then:
+- times every statement run through the dbHelpers helpers (via `add_query_listener`)
+- runs `EXPLAIN QUERY PLAN` once per distinct statement and notes full table scans
+- writes `queries-<worker>.json` into DIR at session end
+- prints statements that scan a whole table, or took longer than `--slow-query-ms`,
+  in the terminal summary
+
+Independently of profiling, `@pytest.mark.uses_index(query, index=None)` fails a test
+when SQLite would answer `query` with a full scan (or without the named index), so a
+dropped index shows up as a failing test:
+
+    @pytest.mark.uses_index("SELECT quantity FROM cart WHERE item_id = ?", index="idx_cart_item_id")
+    def test_cart_lookup_is_indexed() -> None: ...
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import json  # profile export
+import os  # env default + worker id
+import sqlite3  # planning errors
+from pathlib import Path  # robust path handling
+from typing import Any, Optional
+
+import pytest  # hooks
+
+# Local: the helpers being profiled
+from utils import dbHelpers as db
+
+SUMMARY_ROWS = 15
+
+# Per-statement stats: {query: {"calls", "total_s", "max_s", "plan", "scans"}}
+_stats: dict[str, dict[str, Any]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("query-profile", "SQL query profiling")
+    group.addoption(
+        "--query-profile",
+        metavar="DIR",
+        default=os.getenv("QUERY_PROFILE_DIR") or None,
+        help="Time dbHelpers queries, check their plans, and write queries-<worker>.json to DIR.",
+    )
+    group.addoption(
+        "--slow-query-ms",
+        type=float,
+        default=50.0,
+        help="Report statements whose slowest run took at least this long (default 50).",
+    )
+
+
+def _record(query: str, params: Optional[tuple[Any, ...]], seconds: float) -> None:
+    """Query listener: accumulate timings; plan each distinct statement the first time it runs."""
+    key = " ".join(query.split())
+    entry = _stats.get(key)
+    if entry is None:
+        try:
+            plan = db.explain_query_plan(query, params)
+        except sqlite3.Error as exc:
+            plan = [f"<not planned: {exc}>"]
+        entry = _stats[key] = {"calls": 0, "total_s": 0.0, "max_s": 0.0, "plan": plan, "scans": db.full_scans(plan)}
+    entry["calls"] += 1
+    entry["total_s"] += seconds
+    entry["max_s"] = max(entry["max_s"], seconds)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    out_dir = config.getoption("query_profile")
+    if not out_dir:
+        return
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    if not hasattr(config, "workerinput"):
+        # Controller / single process: drop profiles from a previous run.
+        for old in out.glob("queries-*.json"):
+            old.unlink()
+    db.add_query_listener(_record)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    db.remove_query_listener(_record)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item: pytest.Item) -> None:
+    """Check every `uses_index` marker before the test body runs (failures count as test failures)."""
+    for marker in item.iter_markers("uses_index"):
+        db.assert_uses_index(*marker.args, **marker.kwargs)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    out_dir = session.config.getoption("query_profile")
+    if not out_dir or not _stats:
+        return  # disabled, or an xdist controller that ran no queries itself
+    worker = getattr(session.config, "workerinput", {}).get("workerid", "main")
+    queries = [
+        {
+            "query": query,
+            "calls": entry["calls"],
+            "total_ms": round(entry["total_s"] * 1000, 3),
+            "max_ms": round(entry["max_s"] * 1000, 3),
+            "plan": entry["plan"],
+            "scans": entry["scans"],
+        }
+        for query, entry in _stats.items()
+    ]
+    (Path(out_dir) / f"queries-{worker}.json").write_text(json.dumps({"worker": worker, "queries": queries}, indent=1))
+
+
+def summarize(out: Path) -> list[dict[str, Any]]:
+    """Merge every worker profile in `out` into one row per statement, slowest total first."""
+    merged: dict[str, dict[str, Any]] = {}
+    for path in out.glob("queries-*.json"):
+        for row in json.loads(path.read_text())["queries"]:
+            entry = merged.setdefault(row["query"], {**row, "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["calls"] += row["calls"]
+            entry["total_ms"] += row["total_ms"]
+            entry["max_ms"] = max(entry["max_ms"], row["max_ms"])
+    return sorted(merged.values(), key=lambda r: r["total_ms"], reverse=True)
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    out_dir: Optional[str] = config.getoption("query_profile")
+    if not out_dir or hasattr(config, "workerinput"):
+        return
+    rows = summarize(Path(out_dir))
+    if not rows:
+        return
+    slow_ms = config.getoption("slow_query_ms")
+    flagged = [r for r in rows if r["scans"] or r["max_ms"] >= slow_ms]
+    tr = terminalreporter
+    tr.write_sep("=", "query profile (dbHelpers)")
+    tr.write_line(f"{len(rows)} distinct statements, {sum(r['calls'] for r in rows)} calls, "
+                  f"{sum(r['total_ms'] for r in rows):.1f} ms total")
+    if not flagged:
+        tr.write_line(f"no full table scans; no statement took {slow_ms:g} ms or more")
+    else:
+        tr.write_line(f"{'calls':>6} {'total ms':>10} {'max ms':>9}  statement / flags")
+        for row in flagged[:SUMMARY_ROWS]:
+            flags = [f"scan: {s}" for s in row["scans"]] + (["slow"] if row["max_ms"] >= slow_ms else [])
+            tr.write_line(f"{row['calls']:>6} {row['total_ms']:>10.1f} {row['max_ms']:>9.1f}  {row['query']}")
+            tr.write_line(f"{'':>28}{'; '.join(flags)}")
+    tr.write_line(f"profiles: {Path(out_dir).resolve()}")
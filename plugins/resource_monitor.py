@@ -0,0 +1,374 @@
+# plugins/resource_monitor.py
+"""App-under-test resource monitoring: was the server CPU-, memory- or fd-bound during a test?
+
+Enable with `--resource-monitor` (or `RESOURCE_MONITOR=1`). The session fixture
+`resource_monitor` then:
+- finds the server process from `--monitor-pid` (a PID, or a file holding one such as
+  the workflow's `server.pid`), or else from the port in `base_url` (via `/proc/net/tcp`)
+- samples it and all its child processes every `--monitor-interval` seconds on a
+  background thread: CPU %, RSS, open file descriptors, plus the size of the SQLite
+  file at `utils.dbHelpers.DB_PATH` (including `-wal` / `-shm`)
+- attaches each test's slice of the time series to its report (`user_properties`
+  entry "resources") and writes `resources-<worker>.json` into `--monitor-dir`
+- drops samples from before the running test started, so the monitor only ever holds
+  one test's window however long the session is
+- prints the tests with the highest CPU and RSS growth in the terminal summary
+
+Linux only (reads `/proc`); elsewhere the fixture warns and yields None. With
+`--standin` the server runs inside the pytest process, so its numbers include the
+test code itself.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import bisect  # window bounds in the time-ordered samples
+import itertools  # slice the sample deque
+import json  # per-worker export
+import os  # /proc access, clock ticks, env default
+import threading  # background sampler
+import time  # sample timestamps
+from collections import deque  # samples, pruned from the left
+from dataclasses import dataclass  # sample record
+from pathlib import Path  # robust path handling
+from typing import Any, Generator, Optional
+from urllib.parse import urlparse  # port from base_url
+
+import pytest  # hooks + fixtures
+
+# Local: the database file whose size is tracked
+from utils import dbHelpers as db
+
+PROC = Path("/proc")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+SUMMARY_ROWS = 10
+
+# Monotonic start of each test's setup, so its report gets the samples from then on.
+_STARTED = pytest.StashKey[float]()
+
+# Per-test summaries of this process's run: {nodeid: {...}} (written at session end).
+_tests: dict[str, dict[str, Any]] = {}
+_monitor: Optional["ResourceMonitor"] = None
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("resource-monitor", "App-under-test resource monitoring")
+    group.addoption(
+        "--resource-monitor",
+        action="store_true",
+        default=os.getenv("RESOURCE_MONITOR", "").lower() in ("1", "true", "yes"),
+        help="Sample the app's CPU/RSS/fds and SQLite size per test (Linux /proc).",
+    )
+    group.addoption(
+        "--monitor-pid",
+        default=os.getenv("MONITOR_PID") or None,
+        help="Server PID, or a file containing it (e.g. server.pid). Default: the process listening on base_url's port.",
+    )
+    group.addoption(
+        "--monitor-interval",
+        type=float,
+        default=0.2,
+        help="Seconds between samples (default 0.2).",
+    )
+    group.addoption(
+        "--monitor-dir",
+        default="build/resources",
+        help="Where resources-<worker>.json is written (default build/resources).",
+    )
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One reading of the server process tree."""
+
+    t: float  # time.monotonic()
+    cpu_pct: float  # since the previous sample; 100 = one core fully busy
+    rss_mb: float
+    fds: Optional[int]  # None when /proc/<pid>/fd is not readable (other user)
+    db_mb: float
+
+    def as_row(self, t0: float) -> list[Any]:
+        return [round(self.t - t0, 3), round(self.cpu_pct, 1), round(self.rss_mb, 2), self.fds, round(self.db_mb, 3)]
+
+
+SAMPLE_FIELDS = ["t_s", "cpu_pct", "rss_mb", "fds", "db_mb"]
+
+
+def pid_listening_on(port: int) -> Optional[int]:
+    """Return the PID of the process with a listening TCP socket on `port`, if it can be seen."""
+    inodes = set()
+    for table in ("tcp", "tcp6"):
+        try:
+            lines = (PROC / "net" / table).read_text().splitlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            fields = line.split()
+            local, state, inode = fields[1], fields[3], fields[9]
+            if state == "0A" and int(local.rsplit(":", 1)[1], 16) == port:  # 0A = LISTEN
+                inodes.add(f"socket:[{inode}]")
+    if not inodes:
+        return None
+    for proc in PROC.iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            if any(os.readlink(fd) in inodes for fd in (proc / "fd").iterdir()):
+                return int(proc.name)
+        except OSError:
+            continue  # exited, or not ours to inspect
+    return None
+
+
+def resolve_pid(spec: Optional[str], base_url: Optional[str]) -> Optional[int]:
+    """PID from `--monitor-pid` (number or pid file), else from the port in `base_url`.
+
+    Returns None if no running process matches: nothing listens on the port, or the pid
+    file is missing or unreadable, or it names a process that has exited.
+    """
+    if spec:
+        try:
+            pid = int(spec if spec.isdigit() else Path(spec).read_text().strip())
+        except (OSError, ValueError):
+            return None
+        return pid if (PROC / str(pid)).is_dir() else None
+    if base_url:
+        parsed = urlparse(base_url)
+        return pid_listening_on(parsed.port or (443 if parsed.scheme == "https" else 80))
+    return None
+
+
+def process_tree(root: int) -> list[int]:
+    """`root` plus every descendant (e.g. `npm start` and the node process it spawned)."""
+    children: dict[int, list[int]] = {}
+    for proc in PROC.iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            stat = (proc / "stat").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(proc.name))
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, []))
+    return tree
+
+
+def _read_process(pid: int) -> Optional[tuple[int, float, Optional[int]]]:
+    """(cpu ticks, rss MB, open fds) for one process, or None if it is gone."""
+    try:
+        fields = (PROC / str(pid) / "stat").read_text().rsplit(")", 1)[1].split()
+        ticks = int(fields[11]) + int(fields[12])  # utime + stime
+        rss_kb = 0
+        for line in (PROC / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+                break
+    except (OSError, IndexError, ValueError):
+        return None
+    try:
+        fds: Optional[int] = len(os.listdir(PROC / str(pid) / "fd"))
+    except OSError:
+        fds = None
+    return ticks, rss_kb / 1024, fds
+
+
+def _db_size_mb() -> float:
+    path = Path(db.DB_PATH)
+    total = 0
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            total += path.with_name(path.name + suffix).stat().st_size
+        except OSError:
+            pass
+    return total / (1024 * 1024)
+
+
+class ResourceMonitor:
+    """Samples a process tree on a daemon thread until `stop()`."""
+
+    def __init__(self, pid: int, interval: float = 0.2) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.samples: deque[Sample] = deque()
+        self._times: deque[float] = deque()  # `Sample.t` of each sample, for bisect
+        self.t0 = time.monotonic()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._last: Optional[tuple[float, int]] = None  # (time, total ticks) for CPU deltas
+
+    def start(self) -> "ResourceMonitor":
+        self.sample()  # baseline for the first CPU delta
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> Optional[Sample]:
+        """Take one reading now (also called by the thread); None once the server is gone."""
+        with self._lock:  # the thread and end-of-test readings share the CPU baseline
+            return self._sample()
+
+    def _sample(self) -> Optional[Sample]:
+        readings = [r for r in map(_read_process, process_tree(self.pid)) if r is not None]
+        if not readings:
+            return None
+        now = time.monotonic()
+        ticks = sum(r[0] for r in readings)
+        cpu = 0.0
+        if self._last is not None and now > self._last[0]:
+            cpu = (ticks - self._last[1]) / CLOCK_TICKS / (now - self._last[0]) * 100
+        self._last = (now, ticks)
+        fds = [r[2] for r in readings]
+        sample = Sample(
+            t=now,
+            cpu_pct=max(cpu, 0.0),
+            rss_mb=sum(r[1] for r in readings),
+            fds=None if None in fds else sum(fds),  # type: ignore[arg-type]
+            db_mb=_db_size_mb(),
+        )
+        self.samples.append(sample)
+        self._times.append(now)
+        return sample
+
+    def window(self, start: float, end: float) -> list[Sample]:
+        """Samples taken between two `time.monotonic()` values."""
+        with self._lock:
+            first = bisect.bisect_left(self._times, start)
+            last = bisect.bisect_right(self._times, end)
+            return list(itertools.islice(self.samples, first, last))
+
+    def prune(self, before: float) -> None:
+        """Drop samples taken before `before` (no running test's window reaches back that far)."""
+        with self._lock:
+            while self._times and self._times[0] < before:
+                self._times.popleft()
+                self.samples.popleft()
+
+
+def summarize_window(samples: list[Sample], t0: float) -> dict[str, Any]:
+    """Peak/mean CPU, RSS growth, peak fds and DB growth over one test, plus its series."""
+    if not samples:
+        return {"samples": 0}
+    fds = [s.fds for s in samples if s.fds is not None]
+    return {
+        "samples": len(samples),
+        "cpu_peak_pct": round(max(s.cpu_pct for s in samples), 1),
+        "cpu_mean_pct": round(sum(s.cpu_pct for s in samples) / len(samples), 1),
+        "rss_peak_mb": round(max(s.rss_mb for s in samples), 2),
+        "rss_delta_mb": round(samples[-1].rss_mb - samples[0].rss_mb, 2),
+        "fds_peak": max(fds) if fds else None,
+        "db_delta_mb": round(samples[-1].db_mb - samples[0].db_mb, 3),
+        "fields": SAMPLE_FIELDS,
+        "series": [s.as_row(t0) for s in samples],
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def resource_monitor(pytestconfig: pytest.Config, request: pytest.FixtureRequest) -> Generator[Optional[ResourceMonitor], None, None]:
+    """Sample the app-under-test for the whole session when `--resource-monitor` is set (see module docstring)."""
+    global _monitor
+    if not pytestconfig.getoption("resource_monitor"):
+        yield None
+        return
+    if not PROC.is_dir():
+        print("[DEBUG] --resource-monitor needs /proc (Linux); monitoring disabled")
+        yield None
+        return
+
+    spec = pytestconfig.getoption("monitor_pid")
+    base_url = None if spec else request.getfixturevalue("base_url")
+    pid = resolve_pid(spec, base_url)
+    if pid is None:
+        source = f"--monitor-pid {spec}" if spec else f"a process listening for {base_url}"
+        print(f"[DEBUG] No running process found for {source}; resource monitoring disabled")
+        yield None
+        return
+
+    _monitor = ResourceMonitor(pid, pytestconfig.getoption("monitor_interval")).start()
+    print(f"[DEBUG] Monitoring PID {pid} (+ children) every {_monitor.interval}s")
+    try:
+        yield _monitor
+    finally:
+        _monitor.stop()  # kept until unconfigure: the last test's teardown report is made after this
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    item.stash[_STARTED] = time.monotonic()
+    if _monitor is not None:
+        # One test runs at a time per process, and earlier ones were summarized at their teardown.
+        _monitor.prune(item.stash[_STARTED])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo[None]):
+    outcome = yield
+    report: pytest.TestReport = outcome.get_result()
+    if report.when != "teardown" or _monitor is None or _STARTED not in item.stash:
+        return
+    _monitor.sample()  # close the window with a reading taken at the test's end
+    summary = summarize_window(_monitor.window(item.stash[_STARTED], time.monotonic()), _monitor.t0)
+    report.user_properties.append(("resources", summary))
+    _tests[item.nodeid] = summary
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not config.getoption("resource_monitor") or hasattr(config, "workerinput"):
+        return
+    out = Path(config.getoption("monitor_dir"))
+    out.mkdir(parents=True, exist_ok=True)
+    for old in out.glob("resources-*.json"):  # controller / single process: drop a previous run
+        old.unlink()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    global _monitor
+    _monitor = None
+    _tests.clear()
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if not config.getoption("resource_monitor") or not _tests:
+        return  # disabled, or an xdist controller that ran no tests itself
+    out = Path(config.getoption("monitor_dir"))
+    out.mkdir(parents=True, exist_ok=True)
+    worker = getattr(config, "workerinput", {}).get("workerid", "main")
+    (out / f"resources-{worker}.json").write_text(json.dumps({"worker": worker, "tests": _tests}, indent=1))
+
+
+def summarize(out: Path) -> dict[str, dict[str, Any]]:
+    """Merge every worker's per-test summaries in `out`."""
+    merged: dict[str, dict[str, Any]] = {}
+    for path in out.glob("resources-*.json"):
+        merged.update(json.loads(path.read_text())["tests"])
+    return merged
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    if not config.getoption("resource_monitor") or hasattr(config, "workerinput"):
+        return
+    tests = {k: v for k, v in summarize(Path(config.getoption("monitor_dir"))).items() if v.get("samples")}
+    if not tests:
+        return
+    tr = terminalreporter
+    tr.write_sep("=", "app-under-test resources")
+    tr.write_line(f"{'cpu peak %':>10} {'cpu mean %':>10} {'rss peak':>9} {'rss +MB':>8} {'fds':>5} {'db +MB':>7}  test")
+    by_load = sorted(tests.items(), key=lambda kv: (kv[1]["cpu_peak_pct"], kv[1]["rss_delta_mb"]), reverse=True)
+    for nodeid, s in by_load[:SUMMARY_ROWS]:
+        fds = "-" if s["fds_peak"] is None else s["fds_peak"]
+        tr.write_line(f"{s['cpu_peak_pct']:>10.1f} {s['cpu_mean_pct']:>10.1f} {s['rss_peak_mb']:>9.1f} "
+                      f"{s['rss_delta_mb']:>8.2f} {fds:>5} {s['db_delta_mb']:>7.3f}  {nodeid}")
+    tr.write_line(f"series per test: {Path(config.getoption('monitor_dir')).resolve()}")
@@ -0,0 +1,194 @@
+# plugins/sharding.py
+"""Duration-aware sharding and longest-first ordering.
+
+Every run records how long each test took (setup + call + teardown) into a history
+file (`--duration-history`, default `build/test-durations.json`). The history is
+then used to:
+- split the selected tests into N shards of roughly equal total time with
+  `--shard i/N` (greedy longest-processing-time: the next-longest test always goes
+  to the currently lightest shard, so cheap `tests/api` / `tests/db` tests fill the
+  gaps left by slow `tests/ui` / `tests/e2e` ones)
+- run tests longest-first with `--longest-first`, so under `pytest -n` the slow tests
+  start early and the short ones even out the workers at the end
+
+Tests missing from the history are estimated from the median of known tests in the
+same directory (then all tests, then `DEFAULT_ESTIMATE_S`), so new tests still land
+somewhere sensible. Recorded values are smoothed (`SMOOTHING`) so one slow run does
+not reshuffle every shard.
+
+Sharded CI jobs each update the history for the tests they ran; combine their files
+with `python -m plugins.sharding BASE SHARD_FILE... -o OUT` (see `merge_histories`).
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import argparse  # merge command line
+import heapq  # lightest shard first
+import json  # history file
+import os  # env defaults
+import statistics  # median estimates
+from collections import defaultdict  # per-test phase sums
+from pathlib import Path  # robust path handling
+from typing import Optional
+
+import pytest  # hooks
+
+DEFAULT_ESTIMATE_S = 1.0
+
+# Weight of the newest measurement when updating the history (1.0 = keep only the latest).
+SMOOTHING = 0.5
+
+# Estimated seconds of the selected shard (for the collection summary line).
+_SHARD_ESTIMATE = pytest.StashKey[float]()
+
+# Durations measured in this run: {nodeid: seconds}, summed over setup/call/teardown.
+_measured: dict[str, float] = defaultdict(float)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("sharding", "Duration-aware sharding")
+    group.addoption(
+        "--shard",
+        metavar="I/N",
+        default=os.getenv("SHARD") or None,
+        help="Run only shard I of N (1-based), balanced by recorded test durations.",
+    )
+    group.addoption(
+        "--longest-first",
+        action="store_true",
+        help="Run tests in order of recorded duration, longest first.",
+    )
+    group.addoption(
+        "--duration-history",
+        default=os.getenv("DURATION_HISTORY", "build/test-durations.json"),
+        help="JSON file of per-test durations, read for sharding and updated after each run.",
+    )
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse "i/N" into (i, N).
+
+    Raises:
+        pytest.UsageError: If the value is malformed or i is not in 1..N.
+    """
+    index, _, total = value.partition("/")
+    try:
+        i, n = int(index), int(total)
+    except ValueError:
+        raise pytest.UsageError(f"--shard expects I/N (e.g. 2/4), got {value!r}") from None
+    if not 1 <= i <= n:
+        raise pytest.UsageError(f"--shard {value}: I must be between 1 and N")
+    return i, n
+
+
+def load_history(path: Path) -> dict[str, float]:
+    """Read `{nodeid: seconds}` from the history file ({} if missing or unreadable)."""
+    try:
+        return {k: float(v) for k, v in json.loads(path.read_text()).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def estimate_durations(nodeids: list[str], history: dict[str, float]) -> dict[str, float]:
+    """Return a duration for every nodeid: recorded, else the directory median, else the global median."""
+    by_dir: dict[str, list[float]] = defaultdict(list)
+    for nodeid, seconds in history.items():
+        by_dir[nodeid.split("::")[0].rpartition("/")[0]].append(seconds)
+    fallback = statistics.median(history.values()) if history else DEFAULT_ESTIMATE_S
+    dir_median = {d: statistics.median(values) for d, values in by_dir.items()}
+    return {
+        nodeid: history.get(nodeid, dir_median.get(nodeid.split("::")[0].rpartition("/")[0], fallback))
+        for nodeid in nodeids
+    }
+
+
+def assign_shards(durations: dict[str, float], shards: int) -> list[list[str]]:
+    """Greedy LPT partition: longest test first, always onto the lightest shard.
+
+    Ties are broken by nodeid and shard number, so every xdist worker (and every CI
+    job) computes the same assignment from the same history.
+    """
+    buckets: list[list[str]] = [[] for _ in range(shards)]
+    heap = [(0.0, index) for index in range(shards)]
+    for nodeid in sorted(durations, key=lambda n: (-durations[n], n)):
+        load, index = heapq.heappop(heap)
+        buckets[index].append(nodeid)
+        heapq.heappush(heap, (load + durations[nodeid], index))
+    return buckets
+
+
+@pytest.hookimpl(trylast=True)  # after -m/-k deselection, so only selected tests are balanced
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    shard = config.getoption("shard")
+    longest_first = config.getoption("longest_first")
+    if not (shard or longest_first) or not items:
+        return
+
+    history = load_history(Path(config.getoption("duration_history")))
+    durations = estimate_durations([item.nodeid for item in items], history)
+
+    if shard:
+        index, total = parse_shard(shard)
+        keep = set(assign_shards(durations, total)[index - 1])
+        deselected = [item for item in items if item.nodeid not in keep]
+        items[:] = [item for item in items if item.nodeid in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        config.stash[_SHARD_ESTIMATE] = sum(durations[nodeid] for nodeid in keep)
+
+    if longest_first:
+        items.sort(key=lambda item: (-durations[item.nodeid], item.nodeid))
+
+
+def pytest_report_collectionfinish(config: pytest.Config, items: list[pytest.Item]) -> Optional[str]:
+    shard = config.getoption("shard")
+    if not shard or _SHARD_ESTIMATE not in config.stash:
+        return None
+    return f"shard {shard}: {len(items)} tests, ~{config.stash[_SHARD_ESTIMATE]:.1f}s by recorded durations"
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    _measured[report.nodeid] += report.duration
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if hasattr(config, "workerinput") or not _measured:
+        return  # the xdist controller (or single process) records for everyone
+    path = Path(config.getoption("duration_history"))
+    history = load_history(path)
+    for nodeid, seconds in _measured.items():
+        previous = history.get(nodeid)
+        history[nodeid] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({k: round(v, 4) for k, v in sorted(history.items())}, indent=1) + "\n")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    _measured.clear()
+
+
+def merge_histories(base: dict[str, float], updated: list[dict[str, float]]) -> dict[str, float]:
+    """Combine histories written by shards that all started from `base`.
+
+    A shard only changes the entries of tests it ran, so an entry that differs from
+    `base` (or is new) is taken from that shard; everything else keeps its base value.
+    """
+    merged = dict(base)
+    for history in updated:
+        merged.update({k: v for k, v in history.items() if base.get(k) != v})
+    return merged
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Merge per-shard duration histories.")
+    cli.add_argument("base", type=Path, help="History the shards started from (may be missing).")
+    cli.add_argument("shards", type=Path, nargs="+", help="Histories written by the shard runs.")
+    cli.add_argument("-o", "--output", type=Path, required=True)
+    args = cli.parse_args()
+    result = merge_histories(load_history(args.base), [load_history(path) for path in args.shards])
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(dict(sorted(result.items())), indent=1) + "\n")
+    print(f"[DEBUG] Merged {len(args.shards)} histories into {args.output} ({len(result)} tests)")
+
@@ -0,0 +1,127 @@
+# scripts/bench_startup.py
+"""Startup benchmark: how long until pytest collects, and starts the first test, per test directory?
+
+Usage (from the repo root):
+
+    python scripts/bench_startup.py                      # every tests/* directory, 3 runs each
+    python scripts/bench_startup.py tests/db tests/api --repeat 5
+    python scripts/bench_startup.py tests/db -- -p no:qase_pytest   # extra pytest args after `--`
+
+For each directory it runs, in fresh processes:
+- `pytest --collect-only -q DIR` and times the whole process (collect_s)
+- `pytest -q -x <first test of DIR>` with this file loaded as a plugin (`-p bench_startup`),
+  which stamps the moment the first test's setup starts (ready_s: imports, plugins,
+  configuration and collection) and the moment it finishes (first_done_s: plus its fixtures)
+
+Medians are printed as a table and written to `build/startup/report.json` (`--out`).
+The test's outcome does not matter (a UI test without browsers still shows its startup cost).
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import argparse  # command line
+import json  # report file + probe stamps
+import os  # probe env
+import statistics  # medians
+import subprocess  # fresh pytest processes
+import sys  # current interpreter
+import tempfile  # probe stamp file
+import time  # wall clock
+from pathlib import Path  # robust path handling
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+_STAMP_ENV = "BENCH_STARTUP_STAMPS"
+
+
+# --- probe: loaded inside the measured pytest process via `-p bench_startup` ---
+
+def _stamp(name: str) -> None:
+    path = os.environ.get(_STAMP_ENV)
+    if path:
+        with open(path, "a") as handle:
+            handle.write(json.dumps({name: time.time()}) + "\n")
+
+
+def pytest_runtest_logstart(nodeid: str, location: Any) -> None:
+    _stamp("ready")
+
+
+def pytest_runtest_logfinish(nodeid: str, location: Any) -> None:
+    _stamp("done")
+
+
+# --- driver ---
+
+def _run(args: list[str], stamps: Optional[Path] = None) -> tuple[float, subprocess.CompletedProcess[str]]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT / "scripts"), os.environ.get("PYTHONPATH")])))
+    if stamps is not None:
+        env[_STAMP_ENV] = str(stamps)
+    started = time.time()
+    proc = subprocess.run([sys.executable, "-m", "pytest", "-p", "no:cacheprovider", *args],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    return started, proc
+
+
+def first_test(directory: str, extra: list[str]) -> Optional[str]:
+    _, proc = _run(["--collect-only", "-q", directory, *extra])
+    return next((line.strip() for line in proc.stdout.splitlines() if "::" in line), None)
+
+
+def measure(directory: str, repeat: int, extra: list[str]) -> dict[str, Any]:
+    """Median collect / first-test-ready / first-test-done seconds for one directory."""
+    nodeid = first_test(directory, extra)
+    collect, ready, done = [], [], []
+    for _ in range(repeat):
+        started, _ = _run(["--collect-only", "-q", directory, *extra])
+        collect.append(time.time() - started)
+        if nodeid is None:
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            stamps = Path(tmp) / "stamps.jsonl"
+            started, _ = _run(["-q", "-x", "-p", "bench_startup", nodeid, *extra], stamps)
+            marks: dict[str, float] = {}
+            if stamps.exists():
+                for line in stamps.read_text().splitlines():
+                    marks.update(json.loads(line))
+        if "ready" in marks:
+            ready.append(marks["ready"] - started)
+        if "done" in marks:
+            done.append(marks["done"] - started)
+
+    def median(values: list[float]) -> Optional[float]:
+        return round(statistics.median(values), 3) if values else None
+
+    return {"dir": directory, "first_test": nodeid, "runs": repeat,
+            "collect_s": median(collect), "ready_s": median(ready), "first_done_s": median(done)}
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    extra = argv[argv.index("--") + 1:] if "--" in argv else []
+    argv = argv[:argv.index("--")] if "--" in argv else argv
+    cli = argparse.ArgumentParser(description="Measure pytest startup per test directory.")
+    cli.add_argument("dirs", nargs="*", help="Test directories (default: every tests/* package).")
+    cli.add_argument("--repeat", type=int, default=3, help="Runs per directory (median is reported).")
+    cli.add_argument("--out", type=Path, default=ROOT / "build" / "startup" / "report.json")
+    args = cli.parse_args(argv)
+
+    dirs = args.dirs or sorted(str(p.relative_to(ROOT)) for p in (ROOT / "tests").iterdir()
+                               if p.is_dir() and (p / "__init__.py").exists())
+    rows = [measure(d, args.repeat, extra) for d in dirs]
+
+    def fmt(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    print(f"{'dir':<16} {'collect s':>10} {'ready s':>9} {'first done s':>13}  first test")
+    for row in rows:
+        print(f"{row['dir']:<16} {fmt(row['collect_s']):>10} {fmt(row['ready_s']):>9} "
+              f"{fmt(row['first_done_s']):>13}  {row['first_test'] or '(none collected)'}")
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({"pytest_args": extra, "dirs": rows}, indent=1))
+    print(f"report: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
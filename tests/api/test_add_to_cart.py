@@ -1,12 +1,15 @@
 # tests/api/test_add_to_cart.py
 """API smoke test: verify POST /add-to-cart succeeds for a known item.
 
-This file focuses on the HTTP contract (status/redirect). It does NOT assert DB or UI state.
-Those are covered in dedicated API→DB and API→DB→UI tests.
+This file focuses on the HTTP contract (status/redirect). It does NOT assert DB or UI state,
+except for the concurrent test, which checks no add was lost. The rest are covered in dedicated
+API→DB and API→DB→UI tests.
 """
 
 from playwright.sync_api import APIRequestContext  # fixture type hint for clarity in IDEs
 from utils.api_helpers import reset_cart, add_to_cart  # small wrappers that assert status codes
+from utils.async_api_helpers import run_add_to_cart_many  # concurrent batch of add-to-cart calls
+from utils import dbHelpers as db  # final cart state after the concurrent adds
 
 
 def test_add_to_cart(api_request_context: APIRequestContext) -> None:
@@ -68,6 +71,30 @@ def test_add_multiple_items(api_request_context: APIRequestContext) -> None:
     print("✅ API-only: multiple items added successfully")
 
 
+def test_add_multiple_items_concurrently(api_request_context: APIRequestContext, base_url: str) -> None:
+    """Verify that concurrent additions of different items all succeed and all land in the cart.
+
+    Sends one request per item with several in flight at once. The helper raises a
+    single AssertionError listing every failed request, if any.
+    """
+    # Step 1: ensure clean state
+    reset_cart(api_request_context)
+
+    # Step 2: add multiple items concurrently
+    test_items = [1, 2, 3]
+    results = run_add_to_cart_many(base_url, test_items, concurrency=3)
+
+    # Step 3: every request succeeded, and none of the adds was lost
+    statuses = [r.status for r in results]
+    assert all(status in (200, 201) for status in statuses), f"Expected 200/201 for every add, got {statuses}"
+    for item_id in test_items:
+        db.wait_for_cart_quantity(item_id, 1)
+    assert db.get_cart() == {item_id: 1 for item_id in test_items}
+
+    slowest = max(r.latency_ms for r in results)
+    print(f"✅ API-only: {len(results)} items added concurrently (slowest {slowest:.1f} ms)")
+
+
 def test_add_invalid_quantity(api_request_context: APIRequestContext) -> None:
     """Verify that adding items with invalid quantities is properly handled.
 
@@ -0,0 +1,30 @@
+# tests/db/conftest.py
+"""Fixtures shared by the `db` suite."""
+
+from pathlib import Path  # tmp_path / return type
+from typing import Generator
+
+import pytest  # pytest fixture decorator
+
+from utils import dbHelpers as db  # helpers to retarget
+
+
+@pytest.fixture
+def db_copy(tmp_path: Path) -> Generator[Path, None, None]:
+    """Point `utils.dbHelpers` at a private copy of the database for one test.
+
+    Tests can write to the copy freely; the helpers go back to the shared
+    database afterwards.
+
+    Example:
+
+        def test_bulk(db_copy):
+            db.bulk_insert("items", ("name", "price"), rows)   # lands in db_copy only
+    """
+    shared_db = db.DB_PATH
+    copy = db.copy_database(tmp_path / "shop.db")
+    db.set_db_path(copy)
+    try:
+        yield copy
+    finally:
+        db.set_db_path(shared_db)
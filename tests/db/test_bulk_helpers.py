@@ -0,0 +1,38 @@
+# tests/db/test_bulk_helpers.py
+"""DB check: bulk_insert seeds in one transaction, iter_rows streams the result, and set_cart validates its input."""
+
+import sqlite3  # expected constraint error
+from pathlib import Path  # db_copy type hint
+
+import pytest  # raises
+from utils import dbHelpers as db  # bulk/streaming helpers under test
+
+ROWS = 5_000
+
+
+def test_bulk_insert_and_iter_rows(db_copy: Path) -> None:
+    """Seed a private copy of the DB, stream it back in batches, and check atomicity."""
+    before = db.fetch_one("SELECT COUNT(*) FROM items")[0]
+
+    inserted = db.bulk_insert("items", ("name", "price"), ((f"Bulk {n}", 1.0) for n in range(ROWS)))
+    assert inserted == ROWS
+
+    names = [name for (name,) in db.iter_rows("SELECT name FROM items WHERE name LIKE 'Bulk %'", batch_size=64)]
+    assert len(names) == ROWS
+    assert db.fetch_one("SELECT COUNT(*) FROM items")[0] == before + ROWS
+
+    # A failing row rolls the whole batch back.
+    with pytest.raises(sqlite3.IntegrityError):
+        db.execute_many("INSERT INTO items (id, name, price) VALUES (?, ?, ?)", [(-1, "ok", 1.0), (-1, "dup", 1.0)])
+    assert db.fetch_one("SELECT COUNT(*) FROM items WHERE id = -1")[0] == 0
+
+
+def test_set_cart_rejects_bad_lines(db_copy: Path) -> None:
+    """Zero/negative quantities and unknown item ids fail before the cart is touched."""
+    item_id = db.get_item_ids()[0]
+    db.set_cart({item_id: 2})
+
+    for quantities in ({item_id: 0}, {item_id: -1}, {item_id: 1, max(db.get_item_ids()) + 1: 1}):
+        with pytest.raises(ValueError):
+            db.set_cart(quantities)
+    assert db.get_cart() == {item_id: 2}
@@ -0,0 +1,36 @@
+# tests/db/test_catalog_cache.py
+"""DB check: the cached catalog matches `items` and reloads when the table changes."""
+
+import sqlite3  # an outside writer, like the app
+from contextlib import closing  # close the outside writer deterministically
+from pathlib import Path  # db_copy type hint
+
+from utils import dbHelpers as db  # catalog helpers under test
+
+
+def test_catalog_lookups_match_items_table() -> None:
+    """Every cached id/name pair matches a direct query, in both directions."""
+    rows = db.fetch_all("SELECT id, name FROM items ORDER BY id", readonly=True)
+    assert rows, "Expected seeded items in the database"
+
+    assert db.get_item_ids() == [item_id for item_id, _ in rows]
+    for item_id, name in rows:
+        assert db.get_item_name(item_id) == name
+        assert db.get_item_name(item_id) == name  # served from the cache
+        assert db.get_item_id(name) is not None
+    assert db.get_item_name(-1) is None
+    assert db.get_item_id("No such item") is None
+
+
+def test_catalog_reloads_after_outside_write(db_copy: Path) -> None:
+    """A commit from another connection is picked up via PRAGMA data_version."""
+    before = db.get_catalog()
+    assert db.get_catalog() is before, "Unchanged DB should reuse the cached snapshot"
+    first_id = db.get_item_ids()[0]
+
+    with closing(sqlite3.connect(str(db_copy))) as outside, outside:
+        outside.execute("UPDATE items SET name = 'Renamed' WHERE id = ?", (first_id,))
+
+    assert db.get_catalog() is not before
+    assert db.get_item_name(first_id) == "Renamed"
+    assert db.get_item_id("Renamed") == first_id
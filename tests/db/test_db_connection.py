@@ -1,6 +1,12 @@
 # tests/db/test_db_connection.py
 """DB smoke test: confirm the SQLite DB is readable and `items` has data."""
 
+import importlib.util  # load a fresh copy of the module
+import sys  # register that copy while it loads
+from pathlib import Path  # tmp_path type hint
+
+import pytest  # monkeypatch
+
 from utils import dbHelpers as db  # shared DB helpers (fetch_one, etc.)
 
 
@@ -16,3 +22,25 @@ def test_database_connection() -> None:
     print(f"✅ DB reachable. items count = {count}")
     assert count >= 1, "Expected seeded items in the database"
 
+
+def test_db_path_follows_set_db_path(db_copy: Path) -> None:
+    """The shared module's `DB_PATH` reports the file the helpers were pointed at."""
+    assert db.DB_PATH == db.get_db_path() == db_copy
+    assert db.fetch_one("SELECT COUNT(*) FROM items")[0] >= 1
+
+
+def test_db_path_is_resolved_lazily(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A fresh import leaves the path unresolved; the environment is read on first use."""
+    # Fresh copy of the module, so the shared one (and its connection pool) is untouched.
+    spec = importlib.util.spec_from_file_location("dbHelpers_fresh", db.__file__)
+    fresh = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, fresh)
+    monkeypatch.delenv("DB_PATH", raising=False)
+    spec.loader.exec_module(fresh)
+    assert fresh._db_path is None, "importing must not resolve DB_PATH"
+
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "env.db"))
+    assert fresh.DB_PATH == fresh.get_db_path() == tmp_path / "env.db"
+
+    fresh.set_db_path(tmp_path / "other.db")
+    assert fresh.DB_PATH == tmp_path / "other.db"
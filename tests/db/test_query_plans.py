@@ -0,0 +1,32 @@
+# tests/db/test_query_plans.py
+"""DB check: hot lookups are answered with index searches, not full table scans."""
+
+import pytest  # uses_index marker
+
+from utils import dbHelpers as db  # plan helpers
+
+
+@pytest.mark.uses_index("SELECT name FROM items WHERE id = ?")
+def test_item_lookup_by_id_uses_index() -> None:
+    """`items` by id goes through the primary key (checked by the marker before this runs)."""
+    plan = db.explain_query_plan("SELECT name FROM items WHERE id = ?")
+    print(f"[DEBUG] plan: {plan}")
+    assert any("PRIMARY KEY" in step for step in plan), f"Expected a primary-key search, got {plan}"
+
+
+@pytest.mark.uses_index("SELECT quantity FROM cart WHERE item_id = ?")
+def test_cart_lookup_by_item_id_uses_index() -> None:
+    """`cart` by item_id (quantity checks after every add) goes through an index on `item_id`."""
+    plan = db.explain_query_plan("SELECT quantity FROM cart WHERE item_id = ?")
+    print(f"[DEBUG] plan: {plan}")
+    assert any("INDEX" in step and "item_id" in step for step in plan), f"Expected an item_id index search, got {plan}"
+
+
+@pytest.mark.xfail(
+    reason="shop.db has no index on items.name; name lookups go through the in-memory catalog "
+    "(db.get_item_id) instead. Remove this mark if the app adds one.",
+    strict=False,
+)
+def test_item_lookup_by_name_uses_index() -> None:
+    """`items` by name would scan the whole table without an index on `name`."""
+    db.assert_uses_index("SELECT id FROM items WHERE name = ?")
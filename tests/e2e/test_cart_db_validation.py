@@ -2,25 +2,25 @@
 """E2E (API → DB) validation.
 
 Proves that POST /add-to-cart updates the SQLite `cart` table:
-- Reset cart via API
+- Restore the `cart` table from the session DB snapshot (`clean_db` fixture)
 - Add the same item twice via API
 - Assert DB quantity == 2
-- Reset cart to clean up
 
 This test focuses on persisted state (DB). UI checks live in UI/E2E tests.
 """
 
+import pytest  # markers
 from playwright.sync_api import APIRequestContext  # fixture type hint for readability
-from utils.api_helpers import reset_cart, add_to_cart  # API helpers (assert on status)
+from utils.api_helpers import add_to_cart  # API helpers (assert on status)
 from utils import dbHelpers as db  # DB read helpers
 
 
-def test_add_to_cart_updates_db(api_request_context: APIRequestContext) -> None:
+@pytest.mark.dirty_tables("cart")
+def test_add_to_cart_updates_db(api_request_context: APIRequestContext, clean_db: None) -> None:
     """Adding an item twice via API should persist quantity=2 in the DB."""
     item_id = 1
 
-    # Arrange: ensure clean start
-    reset_cart(api_request_context)
+    # Arrange: `clean_db` restored the cart table from the session snapshot (no HTTP call)
     start_qty = db.get_cart_quantity(item_id)
     print(f"[DEBUG] Start quantity for item {item_id}: {start_qty}")
     assert start_qty == 0, "Cart not empty at test start"
@@ -32,10 +32,7 @@ def test_add_to_cart_updates_db(api_request_context: APIRequestContext) -> None:
     print(f"[DEBUG] Second add status: {resp2.status}")
 
     # Assert: DB reflects the expected persisted quantity
-    qty = db.get_cart_quantity(item_id)
+    # (waits on DB change notifications if the write is still in flight; no sleeps)
+    qty = db.wait_for_cart_quantity(item_id, 2)
     print(f"[DEBUG] DB quantity after adds: {qty}")
     assert qty == 2, f"Expected quantity 2 for item {item_id}, got {qty}"
-
-    # Cleanup
-    reset_cart(api_request_context)
-    print("[DEBUG] Cleanup done (cart reset).")
@@ -10,6 +10,7 @@ Flow:
 
 from playwright.sync_api import Page, APIRequestContext  # Playwright page + API context
 from utils.api_helpers import reset_cart, add_to_cart  # API helpers
+from utils.ui_helpers import go_cart  # consistent navigation to /cart
 from utils import dbHelpers as db  # DB read helpers for assertions
 
 
@@ -37,14 +38,13 @@ def test_cart_quantity_reflects_api_and_db(
     print(f"[DEBUG] Second add status: {r2.status}")
 
     # Assert (DB): quantity is 2
-    qty = db.get_cart_quantity(item_id)
+    # (waits on DB change notifications if the write is still in flight; no sleeps)
+    qty = db.wait_for_cart_quantity(item_id, 2)
     print(f"[DEBUG] DB quantity after adds: {qty}")
     assert qty == 2, f"Expected quantity 2 for item {item_id}, got {qty}"
 
     # Assert (UI): /cart shows quantity=2 for this item
-    page.goto(f"{base_url}/cart")
-    page.wait_for_url("**/cart")
-    page.wait_for_load_state("domcontentloaded")
+    go_cart(page, base_url)
 
     # Accessible row name includes "<item> 2 $" in this app
     row = page.get_by_role("row", name=f"{item_name} 2 $")
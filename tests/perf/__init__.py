@@ -0,0 +1,2 @@
+"""Package marker for performance (load/latency) tests."""
+# This file is intentionally left empty to mark the directory as a package.
@@ -0,0 +1,34 @@
+# tests/perf/conftest.py
+"""Fixtures shared by the `perf` suite: run settings, baseline, and the session report.
+
+Options are registered in the root `conftest.py` (`--perf-*`).
+"""
+
+from pathlib import Path  # report/baseline locations
+from typing import Any, Generator
+
+import pytest  # pytest fixture decorator and scopes
+
+from utils.perf_helpers import load_json, write_json  # JSON report/baseline files
+
+
+@pytest.fixture(scope="session")
+def perf_baseline(pytestconfig: pytest.Config) -> dict[str, Any]:
+    """Stored baseline stats keyed by endpoint (empty if no baseline file exists)."""
+    return load_json(Path(pytestconfig.getoption("perf_baseline")))
+
+
+@pytest.fixture(scope="session")
+def perf_report(pytestconfig: pytest.Config) -> Generator[dict[str, Any], None, None]:
+    """Collect per-endpoint stats; write them as JSON when the session ends.
+
+    With `--perf-update-baseline`, the collected stats are also merged into the baseline file.
+    """
+    report: dict[str, Any] = {}
+    yield report
+    if not report:
+        return
+    write_json(Path(pytestconfig.getoption("perf_report")), report)
+    if pytestconfig.getoption("perf_update_baseline"):
+        baseline_path = Path(pytestconfig.getoption("perf_baseline"))
+        write_json(baseline_path, {**load_json(baseline_path), **report})
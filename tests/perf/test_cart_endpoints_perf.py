@@ -0,0 +1,73 @@
+# tests/perf/test_cart_endpoints_perf.py
+"""Load + latency benchmark for the cart endpoints (`pytest -m perf`).
+
+For each endpoint:
+1) Reset the cart via API
+2) Drive the endpoint with `--perf-concurrency` workers for `--perf-duration` seconds
+3) Record throughput and p50/p95/p99 latency (written to `--perf-report` as JSON)
+4) Fail on transport errors/5xx, when 4xx rejections dominate the samples, or on a
+   regression beyond `--perf-threshold` vs `--perf-baseline`
+
+Deselected by default (see `addopts` in pytest.ini); run with `pytest -m perf`.
+"""
+
+import json  # readable stats in -s output
+
+import pytest  # markers + parametrization
+from playwright.sync_api import APIRequestContext  # fixture type hint for readability
+from utils import dbHelpers as db  # catalog ids to spread adds over
+from utils.api_helpers import reset_cart  # clean state before/after each load run
+from utils.perf_helpers import compare_to_baseline, run_load_sync, summarize  # load driver + stats
+
+MAX_QUANTITY = 10  # app rule: adds beyond this per item are rejected with 400
+
+# More 4xx than this share of the samples means the run measured the app's rejection
+# path instead of the endpoint itself.
+MAX_REJECTED_SHARE = 0.1
+
+# (method, path, adds items): add-to-cart bodies cycle through the whole catalog and
+# the cart is reset periodically, so no item reaches MAX_QUANTITY during the run.
+ENDPOINTS = [
+    pytest.param("GET", "/", False, id="home"),
+    pytest.param("GET", "/cart", False, id="cart"),
+    pytest.param("POST", "/add-to-cart", True, id="add-to-cart"),
+    pytest.param("POST", "/reset-cart", False, id="reset-cart"),
+]
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("method, path, adds_items", ENDPOINTS)
+def test_endpoint_throughput_and_latency(
+    method, path, adds_items, base_url, api_request_context: APIRequestContext,
+    pytestconfig, perf_report, perf_baseline,
+) -> None:
+    """Measure one endpoint under load and compare it with the stored baseline."""
+    concurrency = pytestconfig.getoption("perf_concurrency")
+    duration = pytestconfig.getoption("perf_duration")
+    name = f"{method} {path}"
+
+    # Arrange: clean cart so every run starts from the same state
+    reset_cart(api_request_context)
+    data_factory, reset_every = None, 0
+    if adds_items:
+        ids = db.get_item_ids()
+        data_factory = lambda n: {"itemId": ids[n % len(ids)]}  # noqa: E731
+        # Half the cart's capacity: in-flight adds from other workers can't push an item past the cap.
+        reset_every = max(1, len(ids) * MAX_QUANTITY // 2)
+
+    # Act: drive the endpoint
+    results, elapsed = run_load_sync(base_url, method, path, concurrency, duration, data_factory, reset_every)
+    reset_cart(api_request_context)
+
+    stats = {"concurrency": concurrency, **summarize(results, elapsed)}
+    perf_report[name] = stats
+    print(f"[DEBUG] {name}: {json.dumps(stats)}")
+
+    # Assert: no server errors, few rejections, no regression beyond the threshold
+    assert stats["errors"] == 0, f"{name}: {stats['errors']} of {stats['requests']} requests failed"
+    assert stats["rejected"] <= MAX_REJECTED_SHARE * stats["requests"], (
+        f"{name}: {stats['rejected']} of {stats['requests']} requests were rejected (4xx); "
+        f"latencies would measure the error path ({stats['status_counts']})"
+    )
+    regressions = compare_to_baseline(name, stats, perf_baseline, pytestconfig.getoption("perf_threshold"))
+    assert not regressions, "Performance regressed:\n" + "\n".join(regressions)
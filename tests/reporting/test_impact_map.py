@@ -0,0 +1,48 @@
+# tests/reporting/test_impact_map.py
+"""Change-impact selection rules (pure functions; no app or browser needed).
+
+Flow:
+1) Extract tables from the statements the DB helpers run
+2) Normalize recorded URLs to endpoint paths
+3) Check which map entries a set of targets selects
+4) Check cached DB reads are recorded even when no query runs
+"""
+
+from plugins.impact_map import (  # code under test
+    _current, _parse_endpoint_tables, _reading, _touched, endpoint_of, is_impacted, tables_in,
+)
+
+
+def test_tables_and_endpoints_are_normalized() -> None:
+    assert tables_in("SELECT c.quantity FROM cart c JOIN items i ON i.id = c.item_id") == {"cart", "items"}
+    assert tables_in('INSERT INTO "Items" (id, name) VALUES (?, ?)') == {"items"}
+    assert tables_in("SELECT name FROM sqlite_master") == set()
+    assert endpoint_of("http://localhost:3000/add-to-cart?itemId=1") == "/add-to-cart"
+    assert endpoint_of("/reset-cart") == "/reset-cart"
+    assert endpoint_of("http://localhost:3000") == "/"
+
+
+def test_selection_matches_targets_and_keeps_unknown_tests() -> None:
+    api_test = {"endpoints": ["/add-to-cart", "/reset-cart"], "tables": []}
+    db_test = {"endpoints": [], "tables": ["items"]}
+
+    assert is_impacted(api_test, {"/add-to-cart"})
+    assert not is_impacted(db_test, {"/add-to-cart", "cart"})
+    assert is_impacted(db_test, {"items"})
+    assert is_impacted(None, {"cart"}), "never-recorded tests must still run"
+
+    endpoints_by_table = _parse_endpoint_tables(["/add-to-cart = items, cart", "/reset-cart = cart"])
+    assert endpoints_by_table["cart"] == {"/add-to-cart", "/reset-cart"}
+    assert endpoints_by_table["items"] == {"/add-to-cart"}
+
+
+def test_cached_reads_are_recorded_on_every_call() -> None:
+    """The second test gets `items` too, although the real helper would serve it from cache."""
+    reader = _reading(lambda: "catalog", ("items",))  # stands in for db.get_catalog
+    for nodeid in ("tests/a.py::test_first", "tests/b.py::test_second"):
+        _current["nodeid"] = nodeid
+        try:
+            assert reader() == "catalog"
+        finally:
+            _current["nodeid"] = None
+        assert _touched.pop(nodeid)["tables"] == {"items"}
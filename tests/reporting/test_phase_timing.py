@@ -0,0 +1,50 @@
+# tests/reporting/test_phase_timing.py
+"""Phase-timing aggregation (timer wrappers and summary; no app or browser needed).
+
+Flow:
+1) Wrap a few stand-in helpers, call them nested, and check each outer call is
+   recorded once against this test (navigation under a UI helper still counts)
+2) Write two worker timelines and check the summary adds up their per-test totals
+"""
+
+import json  # timeline files
+from pathlib import Path  # tmp_path type hint
+
+import pytest  # request fixture type hint
+
+from plugins import phase_timing  # module under test
+
+
+def test_nested_same_category_calls_are_recorded_once(request: pytest.FixtureRequest) -> None:
+    inner = phase_timing._timed(lambda: None, "db", "fake.inner")
+    outer = phase_timing._timed(lambda: [inner() for _ in range(3)], "db", "fake.outer")
+    navigate = phase_timing._timed(lambda: None, "navigation", "fake.goto")
+    page_helper = phase_timing._timed(navigate, "ui", "fake.go_home")
+
+    outer()
+    outer()
+    page_helper()
+
+    # Drop the stand-in rows again so they never reach a real `--phase-timings` summary.
+    recorded = phase_timing._helpers.pop(request.node.nodeid)
+    calls = {name: row[0] for (phase, category, name), row in recorded.items()}
+    assert calls == {"fake.outer": 2, "fake.go_home": 1, "fake.goto": 1}
+    assert all(phase == "call" for phase, _, _ in recorded)
+
+
+def test_summary_adds_up_worker_timelines(tmp_path: Path) -> None:
+    def helper(name: str, calls: int, total: float, longest: float) -> dict:
+        return {"phase": "call", "category": "db", "name": name, "calls": calls, "total_s": total, "max_s": longest}
+
+    for worker, tests in {
+        "gw0": {"t::a": [helper("dbHelpers.get_cart", 2, 0.2, 0.15)]},
+        "gw1": {"t::b": [helper("dbHelpers.get_cart", 1, 0.3, 0.3), helper("dbHelpers.fetch_one", 4, 0.1, 0.05)]},
+    }.items():
+        timeline = {"worker": worker, "tests": {n: {"phases": {"call": 1.0}, "helpers": h} for n, h in tests.items()}}
+        (tmp_path / f"timeline-{worker}.json").write_text(json.dumps(timeline))
+
+    rows, by_category = phase_timing.summarize(tmp_path)
+
+    assert rows[0] == ("dbHelpers.get_cart", "db", 3, pytest.approx(0.5), 0.3)
+    assert rows[1] == ("dbHelpers.fetch_one", "db", 4, pytest.approx(0.1), 0.05)
+    assert by_category == {("call", "db"): pytest.approx(0.6)}
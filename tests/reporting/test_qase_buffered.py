@@ -0,0 +1,136 @@
+# tests/reporting/test_qase_buffered.py
+"""Buffered Qase reporter against a local stand-in for the Qase API (no network, no app needed).
+
+Flow:
+1) Start a tiny http.server that answers run/result/complete calls like Qase
+2) Queue results while the endpoint is slow, and check `add()` never waits on it
+3) Check batching, retries on 5xx, and spilling to disk when the endpoint is unreachable or too slow
+"""
+
+import json  # request/response bodies
+import threading  # serve in the background
+import time  # add() latency
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path  # tmp_path type hint
+from typing import Any, Generator
+
+import pytest  # fixtures
+
+from plugins.qase_buffered import BufferedQaseReporter  # reporter under test
+
+PROJECT = "DEMO"
+
+
+class _FakeQase(ThreadingHTTPServer):
+    """Records POSTs; `failures` 503s are returned before the first success; `delay` slows every reply."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.failures = 0
+        self.delay = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _FakeQase
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        time.sleep(self.server.delay)
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        self.server.calls.append((self.path, body))
+        reply = json.dumps({"status": True, "result": {"id": 7}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_qase() -> Generator[_FakeQase, None, None]:
+    server = _FakeQase()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _result(n: int) -> dict[str, Any]:
+    return {"case": {"title": f"test_{n}", "suite_title": "tests / demo"}, "status": "passed", "time_ms": n}
+
+
+def test_results_are_batched_without_blocking(fake_qase: _FakeQase, tmp_path: Path) -> None:
+    """add() returns immediately even with a slow endpoint; close() delivers everything and completes the run."""
+    fake_qase.delay = 0.2
+    reporter = BufferedQaseReporter(
+        fake_qase.url, "token", PROJECT, tmp_path / "spill.jsonl", batch_size=5, flush_interval=0.05, backoff=0.01
+    )
+
+    started = time.perf_counter()
+    for n in range(12):
+        reporter.add(_result(n))
+    assert time.perf_counter() - started < 0.05, "add() must not wait on the endpoint"
+
+    reporter.close(timeout=10)
+    paths = [path for path, _ in fake_qase.calls]
+    sent = [r for path, body in fake_qase.calls if path.endswith("/bulk") for r in body["results"]]
+    assert paths[0] == f"/v1/run/{PROJECT}"
+    assert paths[-1] == f"/v1/run/{PROJECT}/7/complete"
+    assert [r["case"]["title"] for r in sent] == [f"test_{n}" for n in range(12)]
+    assert all(len(body["results"]) <= 5 for path, body in fake_qase.calls if path.endswith("/bulk"))
+    assert reporter.stats["sent"] == 12 and reporter.stats["spilled"] == 0
+    assert not (tmp_path / "spill.jsonl").exists()
+
+
+def test_transient_errors_are_retried(fake_qase: _FakeQase, tmp_path: Path) -> None:
+    """Two 503s are absorbed by the retry budget (3 attempts per request)."""
+    fake_qase.failures = 2
+    reporter = BufferedQaseReporter(fake_qase.url, "token", PROJECT, tmp_path / "spill.jsonl", backoff=0.01)
+    reporter.add(_result(1))
+    reporter.close(timeout=10)
+    assert reporter.error is None
+    assert reporter.stats["sent"] == 1
+
+
+def test_unreachable_endpoint_spills_to_disk(fake_qase: _FakeQase, tmp_path: Path) -> None:
+    """When retries run out, results go to the spill file and the run is not completed."""
+    fake_qase.failures = 1000
+    spill = tmp_path / "spill.jsonl"
+    reporter = BufferedQaseReporter(fake_qase.url, "token", PROJECT, spill, retries=2, backoff=0.01, flush_interval=0.05)
+    for n in range(3):
+        reporter.add(_result(n))
+    reporter.close(timeout=10)
+
+    spilled = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert [entry["result"]["case"]["title"] for entry in spilled] == ["test_0", "test_1", "test_2"]
+    assert reporter.stats["sent"] == 0 and reporter.stats["requests"] == 2, "retries must be bounded"
+    assert "503" in (reporter.error or "")
+
+
+def test_stalled_sender_leaves_run_open(fake_qase: _FakeQase, tmp_path: Path) -> None:
+    """If close() times out mid-delivery, queued results are spilled and the run is not completed."""
+    fake_qase.delay = 0.5
+    spill = tmp_path / "spill.jsonl"
+    reporter = BufferedQaseReporter(fake_qase.url, "token", PROJECT, spill, batch_size=1, flush_interval=0.01)
+    for n in range(3):
+        reporter.add(_result(n))
+    time.sleep(0.05)  # let the sender pick up the first result
+    reporter.close(timeout=0.1)
+
+    assert "timed out" in (reporter.error or "")
+    assert [json.loads(line)["result"]["case"]["title"] for line in spill.read_text().splitlines()] == ["test_1", "test_2"]
+    reporter._thread.join(5)  # the in-flight batch still finishes on its own, then the sender exits
+    assert not reporter._thread.is_alive()
+    assert not any(path.endswith("/complete") for path, _ in fake_qase.calls)
@@ -0,0 +1,83 @@
+# tests/reporting/test_resource_monitor.py
+"""Resource monitor against this pytest process (Linux /proc; no app or browser needed).
+
+Flow:
+1) Open a listening socket and check the port resolves to this process
+   (and that a missing or stale `--monitor-pid` file resolves to nothing)
+2) Sample this process while it burns CPU and allocates memory
+3) Check the window summary reports the load
+4) Check pruning drops earlier samples without changing later windows
+"""
+
+import mmap  # fixed-size memory ballast
+import os  # own PID
+import socket  # listening socket to resolve
+import subprocess  # an exited process for a stale pid file
+import sys  # current interpreter
+import time  # busy loop
+from pathlib import Path  # tmp_path type hint
+
+import pytest  # skipif
+
+from plugins.resource_monitor import PROC, ResourceMonitor, pid_listening_on, resolve_pid, summarize_window  # code under test
+
+BALLAST_CHUNKS = 40
+
+pytestmark = pytest.mark.skipif(not PROC.is_dir(), reason="needs Linux /proc")
+
+
+def test_port_resolves_to_listening_process() -> None:
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        assert pid_listening_on(server.getsockname()[1]) == os.getpid()
+
+
+def test_missing_or_stale_pid_file_disables_monitoring(tmp_path: Path) -> None:
+    pid_file = tmp_path / "server.pid"
+    assert resolve_pid(str(pid_file), None) is None, "missing file"
+    pid_file.write_text("not a pid\n")
+    assert resolve_pid(str(pid_file), None) is None, "unreadable file"
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    pid_file.write_text(exited.stdout)
+    assert resolve_pid(str(pid_file), None) is None, "process has exited"
+    pid_file.write_text(f"{os.getpid()}\n")
+    assert resolve_pid(str(pid_file), None) == os.getpid()
+
+
+def test_samples_show_cpu_and_memory_growth() -> None:
+    started = time.monotonic()
+    monitor = ResourceMonitor(os.getpid(), interval=0.05).start()  # baseline sample before the ballast
+    # Fixed 10 MB of fresh anonymous memory (40 x 256 KB), every page touched so it counts toward RSS.
+    ballast = mmap.mmap(-1, BALLAST_CHUNKS * 256 * 1024)
+    for offset in range(0, len(ballast), mmap.PAGESIZE):
+        ballast[offset] = 1
+    # Bounded CPU burn, long enough for several samples.
+    while time.monotonic() - started < 0.4:
+        sum(range(10_000))
+    monitor.sample()
+    monitor.stop()
+    ballast.close()
+
+    summary = summarize_window(monitor.window(started, time.monotonic()), monitor.t0)
+    assert summary["samples"] >= 5
+    assert summary["cpu_peak_pct"] > 10, summary
+    assert summary["rss_delta_mb"] > 1, summary
+    assert summary["fds_peak"] and summary["fds_peak"] > 0
+    assert len(summary["series"]) == summary["samples"]
+
+
+def test_prune_keeps_only_samples_from_the_running_test() -> None:
+    monitor = ResourceMonitor(os.getpid())
+    for _ in range(4):
+        monitor.sample()
+    started = time.monotonic()
+    for _ in range(3):
+        monitor.sample()
+    current = monitor.window(started, time.monotonic())
+
+    monitor.prune(started)
+
+    assert list(monitor.samples) == current
+    assert len(current) == 3
+    assert monitor.window(0, started) == []
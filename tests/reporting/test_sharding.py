@@ -0,0 +1,46 @@
+# tests/reporting/test_sharding.py
+"""Duration-aware shard assignment (pure functions; no app or browser needed).
+
+Flow:
+1) Build a history with a few slow UI tests and many cheap API/DB tests
+2) Split it into shards and check every test lands in exactly one shard
+3) Check the shards come out balanced and unknown tests get a directory estimate
+"""
+
+import pytest  # raises
+
+from plugins.sharding import assign_shards, estimate_durations, parse_shard  # helpers under test
+
+HISTORY = {
+    **{f"tests/ui/test_pages.py::test_page_{n}": 8.0 + n for n in range(3)},
+    **{f"tests/api/test_api.py::test_call_{n}": 0.2 for n in range(30)},
+    **{f"tests/db/test_db.py::test_query_{n}": 0.1 for n in range(20)},
+}
+
+
+def test_shards_partition_and_balance() -> None:
+    """Every test runs exactly once, and cheap tests even out the shards around the slow ones."""
+    shards = assign_shards(HISTORY, 3)
+
+    assigned = [nodeid for shard in shards for nodeid in shard]
+    assert sorted(assigned) == sorted(HISTORY)
+
+    loads = [sum(HISTORY[nodeid] for nodeid in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 0.2, f"unbalanced shards: {loads}"
+    assert all(any(n.startswith("tests/api") or n.startswith("tests/db") for n in shard) for shard in shards)
+
+
+def test_unknown_tests_use_directory_median() -> None:
+    durations = estimate_durations(
+        ["tests/ui/test_new.py::test_fresh", "tests/new_dir/test_x.py::test_x", "tests/api/test_api.py::test_call_0"],
+        HISTORY,
+    )
+    assert durations["tests/ui/test_new.py::test_fresh"] == 9.0
+    assert durations["tests/api/test_api.py::test_call_0"] == 0.2
+    assert durations["tests/new_dir/test_x.py::test_x"] == 0.2  # global median
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "two/3", "1"])
+def test_bad_shard_values_are_rejected(value: str) -> None:
+    with pytest.raises(pytest.UsageError):
+        parse_shard(value)
@@ -0,0 +1,114 @@
+# tests/scale/conftest.py
+"""Fixtures shared by the `scale` suite: catalog sizes, seeding, and the scaling report.
+
+Options are registered in the root `conftest.py` (`--scale-*`).
+"""
+
+from pathlib import Path  # report location
+from typing import Any, Callable, Generator
+
+import pytest  # pytest fixture decorator and scopes
+
+from utils import dbHelpers as db  # bulk seeding + snapshot restore
+from utils.perf_helpers import scaling_slopes, write_json  # curve analysis + JSON report
+
+
+def _sizes(config: pytest.Config) -> list[int]:
+    return sorted({int(size) for size in config.getoption("scale_sizes").split(",") if size.strip()})
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize `catalog_size` with `--scale-sizes`, smallest first."""
+    if "catalog_size" in metafunc.fixturenames:
+        sizes = _sizes(metafunc.config)
+        metafunc.parametrize("catalog_size", sizes, ids=[f"items={size}" for size in sizes])
+
+
+@pytest.fixture
+def seed_catalog(db_snapshot: Path) -> Generator[Callable[[int, int], list[int]], None, None]:
+    """Return a function that grows `items` to (at least) a given size and fills the cart.
+
+    The function returns the ids of every item now in the catalog, so `len(ids)` is
+    the real row count: more than the requested size if the database already had more.
+    New items copy every column of the first seeded item except `id` and `name`,
+    so the app renders them like real products. `items` and `cart` are restored
+    from the session snapshot afterwards.
+
+    Example:
+
+        ids = seed_catalog(10_000, 1000)   # >= 10k items, first 1000 in the cart (qty 1)
+    """
+
+    def _seed(size: int, cart_lines: int) -> list[int]:
+        db.restore_database(db_snapshot, tables=["items", "cart"])
+        columns = [row[1] for row in db.fetch_all("PRAGMA table_info(items)") if row[1] != "id"]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        template = dict(zip(columns, db.fetch_one(f"SELECT {column_list} FROM items ORDER BY id LIMIT 1")))
+        existing = db.fetch_one("SELECT COUNT(*) FROM items")[0]
+        db.bulk_insert(
+            "items",
+            columns,
+            ([f"Scale item {n}" if c == "name" else template[c] for c in columns] for n in range(existing, size)),
+        )
+        ids = db.get_item_ids()
+        db.set_cart({item_id: 1 for item_id in ids[:cart_lines]})
+        return ids
+
+    yield _seed
+    db.restore_database(db_snapshot, tables=["items", "cart"])
+
+
+# `{metric: {items: ms}}` collected by `scale_report`, and the steep segments found at session end.
+_CURVES = pytest.StashKey[dict[str, dict[int, float]]]()
+_STEEP = pytest.StashKey[list[str]]()
+
+
+@pytest.fixture(scope="session")
+def scale_report(pytestconfig: pytest.Config) -> dict[str, dict[int, float]]:
+    """Collect `{metric: {items: ms}}`; the curves are written and checked at session end.
+
+    Slopes are computed once from every measured size, sorted by size, so the result
+    does not depend on the order the sizes ran in (e.g. `--longest-first`). Super-linear
+    growth is reported in the terminal summary and fails the run's exit status (see
+    `pytest_sessionfinish`), without marking any one size's test as failed.
+    """
+    return pytestconfig.stash.setdefault(_CURVES, {})
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Write the scaling report and fail the session if any curve grew super-linearly."""
+    config = session.config
+    curves = config.stash.get(_CURVES, None)
+    if not curves:
+        return
+    max_slope = config.getoption("scale_max_slope")
+    report: dict[str, Any] = {"max_slope": max_slope, "metrics": {}}
+    steep = []
+    for metric, curve in curves.items():
+        slopes = scaling_slopes(curve)
+        superlinear = [s for s in slopes if s["slope"] > max_slope]
+        report["metrics"][metric] = {
+            "curve_ms": {str(size): ms for size, ms in sorted(curve.items())},
+            "slopes": slopes,
+            "superlinear": superlinear,
+        }
+        steep += [f"{metric}: {s['from']} → {s['to']} items grew as size^{s['slope']}" for s in superlinear]
+    write_json(Path(config.getoption("scale_report")), report)
+    config.stash[_STEEP] = steep
+    if steep and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    steep = config.stash.get(_STEEP, None)
+    if steep is None:
+        return
+    tr = terminalreporter
+    tr.write_sep("=", "data-volume scaling")
+    if steep:
+        tr.write_line(f"Super-linear growth (max slope {config.getoption('scale_max_slope')}):", red=True)
+        for line in steep:
+            tr.write_line(f"  {line}", red=True)
+    else:
+        tr.write_line("every metric grew at most linearly")
+    tr.write_line(f"report: {Path(config.getoption('scale_report')).resolve()}")
@@ -0,0 +1,57 @@
+# tests/scale/test_catalog_scaling.py
+"""Data-volume scaling: how homepage, locator and /cart timings grow with the catalog.
+
+For each size in `--scale-sizes` (10, 1k, 10k, 100k by default):
+1) Grow `items` to that size and put up to `--scale-cart-lines` items in the cart
+2) Time the homepage load, resolving an item's add-to-cart form, and the /cart load
+3) Record {items: ms} per metric, keyed by the actual item count
+4) At session end (`pytest_sessionfinish` in conftest.py), write the curves with log-log slopes
+   to `--scale-report` and fail the run if a metric grew faster than size^`--scale-max-slope`
+   between consecutive sizes
+
+Deselected by default (see `addopts` in pytest.ini); run with `pytest -m scale`.
+Run without `-n`: the curve only holds the sizes measured by the same process.
+"""
+
+import statistics  # median of the locator probes
+import time  # wall-clock timings
+
+import pytest  # markers
+from playwright.sync_api import Page  # Playwright page for type hints
+
+NAVIGATION_TIMEOUT_MS = 120_000  # a 100k-item homepage can take a while
+
+
+def _timed_load(page: Page, url: str) -> float:
+    """Navigate to `url` and return ms until the `load` event."""
+    started = time.perf_counter()
+    page.goto(url, wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+    return (time.perf_counter() - started) * 1000
+
+
+def _timed_form_lookup(page: Page, item_id: int) -> float:
+    """Return ms to resolve the add-to-cart form for `item_id` on the current page."""
+    form = page.locator(f'form:has(input[name="itemId"][value="{item_id}"])')
+    started = time.perf_counter()
+    form.wait_for(state="attached")
+    return (time.perf_counter() - started) * 1000
+
+
+@pytest.mark.scale
+def test_render_time_scaling(catalog_size, page: Page, base_url, pytestconfig, seed_catalog, scale_report) -> None:
+    """Measure one catalog size; growth across sizes is checked at session end (see conftest.py)."""
+    # Arrange: seed the catalog and a large cart
+    ids = seed_catalog(catalog_size, pytestconfig.getoption("scale_cart_lines"))
+    items = len(ids)  # can exceed catalog_size if the database already had more rows
+    page.set_default_timeout(NAVIGATION_TIMEOUT_MS)
+
+    # Act: homepage, form lookups (first / middle / last item), /cart
+    timings = {"home_ms": _timed_load(page, base_url)}
+    probes = [ids[0], ids[len(ids) // 2], ids[-1]]
+    timings["locator_ms"] = statistics.median([_timed_form_lookup(page, item_id) for item_id in probes])
+    timings["cart_ms"] = _timed_load(page, f"{base_url}/cart")
+
+    # Record: one point per metric; the whole curve is checked at session end
+    for metric, ms in timings.items():
+        scale_report.setdefault(metric, {})[items] = round(ms, 2)
+    print(f"[DEBUG] items={items} (requested {catalog_size}): " + ", ".join(f"{m}={ms:.1f}" for m, ms in timings.items()))
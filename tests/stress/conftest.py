@@ -0,0 +1,24 @@
+# tests/stress/conftest.py
+"""Fixtures shared by the `stress` suite: a seeded RNG and the run size.
+
+Options are registered in the root `conftest.py` (`--stress-*`).
+"""
+
+import random  # seeded request mixes
+import secrets  # fresh seed when none is given
+
+import pytest  # pytest fixture decorator and scopes
+
+
+@pytest.fixture
+def stress_seed(pytestconfig: pytest.Config) -> int:
+    """Seed for this test's request mix: `--stress-seed`, or a fresh random one."""
+    seed = pytestconfig.getoption("stress_seed")
+    return seed if seed is not None else secrets.randbelow(2**32)
+
+
+@pytest.fixture
+def stress_rng(stress_seed: int) -> random.Random:
+    """Random generator seeded with `stress_seed` (printed so failures can be replayed)."""
+    print(f"[DEBUG] stress seed: {stress_seed} (replay with --stress-seed {stress_seed})")
+    return random.Random(stress_seed)
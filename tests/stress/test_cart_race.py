@@ -0,0 +1,113 @@
+# tests/stress/test_cart_race.py
+"""Concurrency stress: parallel POST /add-to-cart must not lose updates or exceed the cap.
+
+Flow (per test):
+1) Reset cart via API
+2) Fire many add-to-cart requests concurrently, in a seeded random order
+3) Assert the `cart` table holds exactly min(adds, 10) for every item, and nothing above 10
+
+Deselected by default (see `addopts` in pytest.ini); run with `pytest -m stress`.
+Scale with `--stress-requests` / `--stress-concurrency`; replay with `--stress-seed`.
+"""
+
+import random  # type hint for the seeded RNG fixture
+from collections import Counter  # expected adds per item
+
+import pytest  # markers
+from playwright.sync_api import APIRequestContext  # fixture type hint for readability
+from utils.api_helpers import reset_cart  # clean state
+from utils.async_api_helpers import RequestResult, run_add_to_cart_many  # concurrent adds
+from utils import dbHelpers as db  # final-state assertions
+
+MAX_QUANTITY = 10  # app rule, also checked via the UI in test_homepage_cart.py
+
+
+def _catalog_ids() -> list[int]:
+    """Return every item id in the catalog (the stress mix picks from these)."""
+    ids = db.get_item_ids()
+    assert ids, "Expected seeded items in the database"
+    return ids
+
+
+def _assert_no_server_errors(results: list[RequestResult], seed: int) -> None:
+    """Rejections at the cap are fine; transport errors and 5xx are not."""
+    broken = [r for r in results if r.error or r.status >= 500]
+    assert not broken, (
+        f"{len(broken)} of {len(results)} requests failed (seed={seed}):\n"
+        + "\n".join(f"  - {r.describe()}" for r in broken[:20])
+    )
+
+
+def _assert_cart_matches(adds: Counter, seed: int) -> None:
+    """Cart holds exactly min(adds, cap) per item and no row above the cap."""
+    expected = {item_id: min(count, MAX_QUANTITY) for item_id, count in adds.items()}
+    actual = db.get_cart()
+    assert actual == expected, (
+        f"Cart mismatch after concurrent adds (seed={seed}).\n"
+        f"  adds sent: {dict(adds)}\n  expected:  {expected}\n  actual:    {actual}"
+    )
+    over_cap = {item_id: qty for item_id, qty in actual.items() if qty > MAX_QUANTITY}
+    assert not over_cap, f"Quantities above {MAX_QUANTITY}: {over_cap} (seed={seed})"
+
+
+@pytest.mark.stress
+def test_concurrent_adds_below_cap_lose_no_updates(
+    api_request_context: APIRequestContext, base_url: str, pytestconfig,
+    stress_rng: random.Random, stress_seed: int,
+) -> None:
+    """Up to 10 parallel adds per item must all be counted (classic lost-update check).
+
+    Sends `--stress-requests` adds, spread at random over the catalog with no item past the
+    cap (so the run size is capped at 10 per item); every one of them must be counted.
+    """
+    reset_cart(api_request_context)
+    ids = _catalog_ids()
+    slots = ids * MAX_QUANTITY  # each id once per unit it can hold
+    stress_rng.shuffle(slots)
+    requests = slots[:pytestconfig.getoption("stress_requests")]
+    adds = Counter(requests)
+
+    results = run_add_to_cart_many(
+        base_url, requests, pytestconfig.getoption("stress_concurrency"), raise_on_error=False
+    )
+
+    _assert_no_server_errors(results, stress_seed)
+    _assert_cart_matches(adds, stress_seed)
+    reset_cart(api_request_context)
+
+
+@pytest.mark.stress
+def test_concurrent_adds_same_item_stop_at_cap(
+    api_request_context: APIRequestContext, base_url: str, pytestconfig, stress_seed: int,
+) -> None:
+    """Many parallel adds of one item must land exactly on the cap, never above it."""
+    reset_cart(api_request_context)
+    item_id = _catalog_ids()[0]
+    adds = Counter({item_id: pytestconfig.getoption("stress_requests")})
+
+    results = run_add_to_cart_many(
+        base_url, list(adds.elements()), pytestconfig.getoption("stress_concurrency"), raise_on_error=False
+    )
+
+    _assert_no_server_errors(results, stress_seed)
+    _assert_cart_matches(adds, stress_seed)
+    reset_cart(api_request_context)
+
+
+@pytest.mark.stress
+def test_concurrent_adds_mixed_items_respect_cap(
+    api_request_context: APIRequestContext, base_url: str, pytestconfig,
+    stress_rng: random.Random, stress_seed: int,
+) -> None:
+    """A large seeded mix over the catalog ends at min(adds, cap) for every item."""
+    reset_cart(api_request_context)
+    ids = _catalog_ids()
+    requests = [stress_rng.choice(ids) for _ in range(pytestconfig.getoption("stress_requests"))]
+
+    results = run_add_to_cart_many(
+        base_url, requests, pytestconfig.getoption("stress_concurrency"), raise_on_error=False
+    )
+
+    _assert_no_server_errors(results, stress_seed)
+    _assert_cart_matches(Counter(requests), stress_seed)
+    reset_cart(api_request_context)
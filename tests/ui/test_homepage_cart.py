@@ -15,6 +15,8 @@ paths centralized in `utils/api_helpers.py`, so we don’t duplicate those detai
 every test.
 """
 
+from typing import Callable
+
 from playwright.sync_api import Page, expect
 from utils.api_helpers import reset_cart
 from utils.ui_helpers import (
@@ -40,18 +42,19 @@ def test_add_to_cart_shows_message_and_updates_cart_count(page: Page, base_url:
     expect_text_visible(page, "Item successfully added to cart")
     expect_cart_count(page, initial_count + 1)
 
-def test_add_button_disables_at_max_quantity(page: Page, base_url: str) -> None:
+def test_add_button_disables_at_max_quantity(
+    page: Page, base_url: str, cart_state: Callable[..., dict[int, int]]
+) -> None:
     """Button disables and max-quantity message appears after reaching quantity 10."""
-    # Arrange: reset and open home
-    reset_cart(page.request)
+    # Arrange: seed the cart one below the maximum in a single DB write, then open home
+    cart_state({1: 9})
     go_home(page, base_url)
 
     item_form = page.locator('form:has(input[name="itemId"][value="1"])')
     add_btn = item_form.get_by_role("button")
 
-    # Act: click until the item reaches the maximum (10); each submit redirects
-    for _ in range(10):
-        add_btn.click()
+    # Act: the final click takes the item to the maximum (10); the submit redirects
+    add_btn.click()
 
     # Assert: button disabled and max message visible
     expect(add_btn).to_be_disabled()
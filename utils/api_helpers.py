@@ -20,6 +20,8 @@ Centralizing common actions here ensures consistent status assertions and reques
 shapes across all tests.
 """
 
+from typing import Mapping
+
 # Third‑party: Playwright types for request + response objects
 from playwright.sync_api import APIRequestContext, APIResponse
 
@@ -59,3 +61,23 @@ def add_to_cart(api_request_context: APIRequestContext, item_id: int) -> APIResp
     response = api_request_context.post("/add-to-cart", data={"itemId": item_id})
     assert response.ok, f"Add to cart failed. Status: {response.status}"
     return response
+
+
+def fill_cart(api_request_context: APIRequestContext, quantities: Mapping[int, int]) -> None:
+    """
+    Reset the cart, then add each item the requested number of times via the API.
+
+    Slower than `utils.dbHelpers.set_cart`, but goes through the app's own
+    add-to-cart logic. Prefer the `cart_state` fixture, which picks between the two.
+
+    Args:
+        api_request_context (APIRequestContext): Playwright API request context.
+        quantities (Mapping[int, int]): Target cart as `{item_id: quantity}`.
+
+    Raises:
+        AssertionError: If any request fails.
+    """
+    reset_cart(api_request_context)
+    for item_id, quantity in quantities.items():
+        for _ in range(quantity):
+            add_to_cart(api_request_context, item_id)
@@ -0,0 +1,142 @@
+# utils/app_server.py
+"""Start and stop a private app-under-test instance for one pytest process.
+
+Used by the `--per-worker-app` mode in `conftest.py`: every pytest-xdist worker
+launches its own copy of the sample app on a free port, pointed at its own copy of
+`shop.db`, so workers never reset or read each other's carts.
+
+The app is started with two environment variables it must honor:
+- `PORT`: the TCP port to listen on
+- `DB_PATH`: the SQLite file to use
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import os  # environment for the child process
+import signal  # stop the whole process group (npm spawns node)
+import socket  # ask the OS for a free port
+import subprocess  # launch the app command
+import time  # readiness polling
+import urllib.error  # readiness polling errors
+import urllib.request  # readiness polling without extra deps
+from pathlib import Path  # robust path handling
+from typing import Optional
+
+
+def find_free_port() -> int:
+    """Return a TCP port on localhost that is currently free."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 60.0, process: Optional[subprocess.Popen] = None) -> None:
+    """Poll `url` until it answers with a non-5xx status (mirrors the CI "Wait for app" step).
+
+    Args:
+        url: URL to poll (usually the app homepage).
+        timeout: Seconds to wait before giving up.
+        process: Optional child process; if it exits early we fail fast.
+
+    Raises:
+        RuntimeError: If the app exits or does not answer within `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"App process exited early with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status < 500:
+                    return
+        except urllib.error.HTTPError as exc:
+            if exc.code < 500:
+                return
+        except OSError:
+            pass  # not listening yet
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    raise RuntimeError(f"App at {url} did not start within {timeout:.0f}s")
+
+
+class AppServer:
+    """A single app-under-test process bound to its own port and database file.
+
+    Example:
+
+        server = AppServer("npm start", cwd="app-under-test", db_path=tmp / "shop.db")
+        base_url = server.start()
+        ...
+        server.stop()
+    """
+
+    def __init__(
+        self,
+        command: str,
+        cwd: str | os.PathLike,
+        db_path: str | os.PathLike,
+        port: Optional[int] = None,
+        log_path: Optional[str | os.PathLike] = None,
+        start_timeout: float = 60.0,
+    ) -> None:
+        self.command = command
+        self.cwd = Path(cwd)
+        self.db_path = Path(db_path)
+        self.port = port or find_free_port()
+        self.log_path = Path(log_path) if log_path else self.db_path.with_name("app.log")
+        self.start_timeout = start_timeout
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        """Origin the app listens on, e.g. `http://localhost:40123`."""
+        return f"http://localhost:{self.port}"
+
+    def start(self) -> str:
+        """Launch the app and block until it answers; return its base URL."""
+        env = {**os.environ, "PORT": str(self.port), "DB_PATH": str(self.db_path)}
+        log = open(self.log_path, "wb")
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                env=env,
+                shell=True,  # allows `npm start` on every platform
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=(os.name == "posix"),
+            )
+        finally:
+            log.close()  # the child keeps its own handle
+
+        try:
+            wait_until_ready(f"{self.base_url}/", self.start_timeout, self.process)
+        except RuntimeError as exc:
+            self.stop()
+            tail = self.log_path.read_text(errors="replace")[-2000:]
+            raise RuntimeError(f"{exc}\n--- {self.log_path} ---\n{tail}") from None
+        return self.base_url
+
+    def stop(self) -> None:
+        """Terminate the app (and any children it spawned)."""
+        if self.process is None or self.process.poll() is not None:
+            return
+        self._signal(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._signal(signal.SIGKILL if os.name == "posix" else signal.SIGTERM)
+            self.process.wait()
+
+    def _signal(self, sig: int) -> None:
+        """Send `sig` to the app's process group (POSIX) or the process itself."""
+        assert self.process is not None
+        if os.name == "posix":
+            try:
+                os.killpg(self.process.pid, sig)
+            except ProcessLookupError:
+                pass  # already gone
+        else:
+            self.process.terminate()
@@ -0,0 +1,136 @@
+# utils/asset_cache.py
+"""On-disk cache for static assets in UI tests (opt-in with `--asset-cache`).
+
+Every UI test starts from a fresh browser context, so CSS, JS, images and fonts are
+downloaded again on each `go_home()` or `/cart` visit. `AssetCache` installs a
+Playwright route that serves those static GET responses from disk after the first
+fetch. Everything else always goes to the server:
+
+- HTML documents, XHR/fetch calls, and any non-GET request
+- `/add-to-cart` and `/reset-cart`, whatever their resource type
+
+Entries are keyed by URL and store the server's validators (`ETag`,
+`Last-Modified`). Within `max_age` seconds an entry is served directly; after that it
+is revalidated with `If-None-Match` / `If-Modified-Since`, so changed assets are
+picked up without clearing the cache.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import hashlib  # stable file names from URLs
+import json  # entry metadata
+import os  # atomic replace (xdist workers share the cache dir)
+import tempfile  # atomic writes
+import time  # entry age
+from pathlib import Path  # robust path handling
+from typing import Any, Optional, Union
+from urllib.parse import urlparse  # path checks
+
+# Third‑party: Playwright sync types
+from playwright.sync_api import BrowserContext, Page, Route
+
+# Resource types that may be served from the cache.
+CACHEABLE_RESOURCE_TYPES = frozenset({"stylesheet", "script", "image", "font", "media"})
+
+# Endpoints that must always reach the server.
+PASSTHROUGH_PATHS = frozenset({"/add-to-cart", "/reset-cart"})
+
+# Headers describing the wire encoding; the cached body is stored decoded.
+_DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+class AssetCache:
+    """Serve static GET responses from `cache_dir`, populated on first fetch.
+
+    Args:
+        cache_dir: Folder for cached bodies and metadata (safe to share between workers).
+        max_age: Seconds an entry is served without revalidating.
+    """
+
+    def __init__(self, cache_dir: Path, max_age: float = 300.0) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "passthrough": 0}
+
+    def install(self, target: Union[BrowserContext, Page]) -> None:
+        """Route all requests of a page or context through the cache."""
+        target.route("**/*", self._handle)
+
+    def is_cacheable(self, method: str, resource_type: str, url: str) -> bool:
+        """True for static GET requests that are not one of the pass-through endpoints."""
+        return (
+            method == "GET"
+            and resource_type in CACHEABLE_RESOURCE_TYPES
+            and urlparse(url).path not in PASSTHROUGH_PATHS
+        )
+
+    def _handle(self, route: Route) -> None:
+        request = route.request
+        if not self.is_cacheable(request.method, request.resource_type, request.url):
+            self.stats["passthrough"] += 1
+            route.fallback()  # let other routes (or the network) handle it
+            return
+
+        key = hashlib.sha256(request.url.encode()).hexdigest()
+        entry = self._load(key)
+        if entry and time.time() - entry["stored_at"] < self.max_age:
+            self.stats["hits"] += 1
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=self._body(key))
+            return
+
+        headers = dict(request.headers)
+        if entry and entry.get("etag"):
+            headers["if-none-match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["if-modified-since"] = entry["last_modified"]
+        response = route.fetch(headers=headers)
+
+        if entry and response.status == 304:
+            self.stats["revalidated"] += 1
+            self._store_meta(key, {**entry, "stored_at": time.time()})
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=self._body(key))
+            return
+
+        self.stats["misses"] += 1
+        cache_control = response.headers.get("cache-control", "")
+        if response.status == 200 and "no-store" not in cache_control:
+            body = response.body()
+            stored_headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+            self._store(key, body, {
+                "url": request.url,
+                "status": response.status,
+                "headers": stored_headers,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "stored_at": time.time(),
+            })
+            route.fulfill(status=response.status, headers=stored_headers, body=body)
+        else:
+            route.fulfill(response=response)
+
+    def _load(self, key: str) -> Optional[dict[str, Any]]:
+        meta, body = self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+        if not (meta.exists() and body.exists()):
+            return None
+        try:
+            return json.loads(meta.read_text())
+        except (OSError, ValueError):
+            return None  # partially written by another worker; refetch
+
+    def _body(self, key: str) -> bytes:
+        return (self.cache_dir / f"{key}.body").read_bytes()
+
+    def _store(self, key: str, body: bytes, meta: dict[str, Any]) -> None:
+        self._write_atomic(self.cache_dir / f"{key}.body", body)
+        self._store_meta(key, meta)
+
+    def _store_meta(self, key: str, meta: dict[str, Any]) -> None:
+        self._write_atomic(self.cache_dir / f"{key}.json", json.dumps(meta).encode())
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp, path)
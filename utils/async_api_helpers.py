@@ -0,0 +1,224 @@
+# utils/async_api_helpers.py
+"""Concurrent cart API helpers built on Playwright's async `APIRequestContext`.
+
+`utils/api_helpers.py` sends one request at a time. These helpers dispatch many
+requests concurrently (bounded by `concurrency`), record the status and latency
+of each, and report every failure in one AssertionError instead of stopping at
+the first.
+
+Two ways to use them:
+
+1. Async code that already has an async `APIRequestContext`:
+
+       results = await add_to_cart_many(request_context, [1, 2, 3], concurrency=8)
+
+2. Sync tests (pytest-playwright fixtures are sync): use the `run_*` wrappers, which
+   share one async Playwright driver and event loop on a background thread (started on
+   first use, stopped at interpreter exit or by `close_api_client()`):
+
+       results = run_add_to_cart_many(base_url, [1, 2, 3], concurrency=8)
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import asyncio  # concurrency primitives
+import atexit  # stop the shared driver at exit
+import threading  # background event loop beside the sync Playwright loop
+import time  # per-request latency
+from dataclasses import dataclass  # plain result records
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Mapping, Optional, TypeVar
+
+if TYPE_CHECKING:
+    # Third‑party: async Playwright types (the client itself is imported when first run)
+    from playwright.async_api import APIRequestContext, Playwright
+
+T = TypeVar("T")
+
+# Driver shared by the `run_*` wrappers: {"loop", "thread", "playwright"} once started.
+_client: dict[str, Any] = {}
+_client_lock = threading.Lock()
+
+
+@dataclass
+class RequestResult:
+    """Outcome of one request sent by the batched helpers."""
+
+    method: str
+    path: str
+    data: Optional[Mapping[str, Any]]
+    status: int  # 0 when the request raised before a response arrived
+    latency_ms: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True for a 2xx response (same rule as Playwright's `APIResponse.ok`)."""
+        return self.error is None and 200 <= self.status <= 299
+
+    def describe(self) -> str:
+        """One-line summary used in aggregated failure messages."""
+        outcome = self.error or f"status {self.status}"
+        return f"{self.method} {self.path} {dict(self.data or {})}: {outcome} ({self.latency_ms:.1f} ms)"
+
+
+async def timed_request(
+    api_request_context: APIRequestContext,
+    method: str,
+    path: str,
+    data: Optional[Mapping[str, Any]] = None,
+) -> RequestResult:
+    """Send one request and capture its status and latency (never raises on HTTP errors).
+
+    Args:
+        api_request_context: Async Playwright API request context.
+        method: HTTP method, e.g. "GET" or "POST".
+        path: Path relative to the context's base URL, e.g. "/add-to-cart".
+        data: Form fields for POST requests. Optional.
+    """
+    started = time.perf_counter()
+    try:
+        response = await api_request_context.fetch(path, method=method, data=data)
+        status, error = response.status, None
+        await response.dispose()
+    except Exception as exc:  # network errors are results too, not crashes
+        status, error = 0, f"{type(exc).__name__}: {exc}"
+    latency_ms = (time.perf_counter() - started) * 1000
+    return RequestResult(method, path, data, status, latency_ms, error)
+
+
+def assert_all_ok(results: Iterable[RequestResult], action: str = "requests") -> None:
+    """Raise one AssertionError listing every failed request, if any failed."""
+    results = list(results)
+    failures = [r for r in results if not r.ok]
+    if failures:
+        details = "\n".join(f"  - {r.describe()}" for r in failures)
+        raise AssertionError(f"{len(failures)} of {len(results)} {action} failed:\n{details}")
+
+
+async def post_many(
+    api_request_context: APIRequestContext,
+    path: str,
+    payloads: Iterable[Mapping[str, Any]],
+    concurrency: int = 8,
+    raise_on_error: bool = True,
+) -> list[RequestResult]:
+    """POST each payload to `path` with at most `concurrency` requests in flight.
+
+    Returns:
+        One RequestResult per payload, in input order.
+
+    Raises:
+        AssertionError: If `raise_on_error` and any request failed (lists all failures).
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _send(payload: Mapping[str, Any]) -> RequestResult:
+        async with semaphore:
+            return await timed_request(api_request_context, "POST", path, payload)
+
+    results = list(await asyncio.gather(*(_send(p) for p in payloads)))
+    if raise_on_error:
+        assert_all_ok(results, f"POST {path} requests")
+    return results
+
+
+async def add_to_cart_many(
+    api_request_context: APIRequestContext,
+    items: Iterable[int],
+    concurrency: int = 8,
+    raise_on_error: bool = True,
+) -> list[RequestResult]:
+    """Add every item id in `items` via POST /add-to-cart, concurrently.
+
+    Repeat an id to add it several times, e.g. `[1, 1, 2]`.
+
+    Args:
+        api_request_context: Async Playwright API request context.
+        items: Item ids to add, one request per entry.
+        concurrency: Maximum number of requests in flight.
+        raise_on_error: Raise one aggregated AssertionError if any request failed.
+
+    Returns:
+        One RequestResult per item, in input order.
+    """
+    payloads = [{"itemId": item_id} for item_id in items]
+    return await post_many(api_request_context, "/add-to-cart", payloads, concurrency, raise_on_error)
+
+
+def _shared_client() -> tuple[asyncio.AbstractEventLoop, Playwright]:
+    """Return the background loop and async Playwright driver, starting them on first use."""
+    with _client_lock:
+        if not _client:
+            from playwright.async_api import async_playwright  # deferred: only runs that send requests load it
+
+            async def _start() -> Playwright:
+                return await async_playwright().start()
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-api-client", daemon=True)
+            thread.start()
+            try:
+                playwright = asyncio.run_coroutine_threadsafe(_start(), loop).result()
+            except BaseException:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            _client.update(loop=loop, thread=thread, playwright=playwright)
+            atexit.register(close_api_client)
+        return _client["loop"], _client["playwright"]
+
+
+def close_api_client() -> None:
+    """Stop the shared async Playwright driver and its loop (no-op if not started).
+
+    Registered with `atexit` when the driver starts; the next `run_*` call starts a new one.
+    """
+    with _client_lock:
+        if not _client:
+            return
+        loop, thread, playwright = _client["loop"], _client["thread"], _client["playwright"]
+        _client.clear()
+    try:
+        asyncio.run_coroutine_threadsafe(playwright.stop(), loop).result(timeout=10)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+
+def run_with_api_context(base_url: str, action: Callable[[APIRequestContext], Awaitable[T]]) -> T:
+    """Run `action(request_context)` on the shared async Playwright client and return its result.
+
+    The sync Playwright API (used by pytest-playwright) owns the main thread's event
+    loop, so the async client runs on its own thread and loop. Both, and the Playwright
+    driver process, are started once and reused: only the first call pays the startup,
+    later calls just open a request context for `base_url`. Safe to call from several
+    threads at once.
+    """
+    loop, playwright = _shared_client()
+
+    async def _main() -> T:
+        context = await playwright.request.new_context(base_url=base_url)
+        try:
+            return await action(context)
+        finally:
+            await context.dispose()
+
+    return asyncio.run_coroutine_threadsafe(_main(), loop).result()
+
+
+def run_add_to_cart_many(
+    base_url: str,
+    items: Iterable[int],
+    concurrency: int = 8,
+    raise_on_error: bool = True,
+) -> list[RequestResult]:
+    """Sync wrapper around `add_to_cart_many` for use from regular (sync) tests."""
+    items = list(items)
+    return run_with_api_context(
+        base_url, lambda context: add_to_cart_many(context, items, concurrency, raise_on_error)
+    )
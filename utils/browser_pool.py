@@ -0,0 +1,148 @@
+# utils/browser_pool.py
+"""Reusable browser contexts for UI tests (opt-in with `--context-pool`).
+
+pytest-playwright creates a new browser context and a cold page for every test.
+`ContextPool` instead creates a few contexts once per session (per xdist worker),
+hands out a page from one of them, and on release resets the context's state so
+the next test starts clean. Contexts are created from a saved storage state (captured
+from a first visit to the app when the file does not exist yet), and a released context can immediately start loading `base_url` in a fresh page so the
+next test gets a warm page (HTTP cache, connections, compiled JS).
+
+The `page` fixture in `conftest.py` uses this pool when the option is on.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import json  # read the saved storage state
+from collections import deque  # FIFO of idle contexts
+from pathlib import Path  # robust path handling
+from typing import Any, Optional
+
+# Third‑party: Playwright sync types
+from playwright.sync_api import Browser, BrowserContext, Error, Page
+
+
+class ContextPool:
+    """A fixed-size pool of browser contexts that are reset between tests.
+
+    Args:
+        browser: Session browser from pytest-playwright.
+        context_args: Keyword arguments for `browser.new_context` (usually `browser_context_args`).
+        size: Number of contexts to keep.
+        storage_state: JSON file with cookies/localStorage to start every context from.
+            Optional. Without one, a reset only clears cookies, localStorage and permissions.
+        state_url: Page to load once, in a throwaway context, to create `storage_state` when
+            the file does not exist yet (so it holds what the app sets on a first visit).
+            Without it a missing file is left missing. Optional.
+        prewarm_url: If set, released contexts open a page and start loading this URL
+            without waiting for it to finish, so the next test gets a warm page. Optional.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        context_args: dict[str, Any],
+        size: int = 2,
+        storage_state: Optional[Path] = None,
+        state_url: Optional[str] = None,
+        prewarm_url: Optional[str] = None,
+    ) -> None:
+        self.browser = browser
+        self.context_args = dict(context_args)
+        self.storage_state = storage_state
+        self.prewarm_url = prewarm_url
+        self._state: dict[str, Any] = {"cookies": [], "origins": []}
+        self._idle: deque[tuple[BrowserContext, Optional[Page]]] = deque()
+        self._leased: dict[Page, BrowserContext] = {}
+
+        if storage_state is not None and not storage_state.exists() and state_url:
+            self._capture_storage_state(state_url, storage_state)
+        if storage_state is not None and storage_state.exists():
+            self._state = json.loads(storage_state.read_text())
+            self.context_args["storage_state"] = str(storage_state)
+
+        for _ in range(max(1, size)):
+            context = self._new_context()
+            self._idle.append((context, self._prewarm(context)))
+
+    def acquire(self) -> Page:
+        """Return a page from an idle context (pre-warmed if enabled)."""
+        context, page = self._idle.popleft() if self._idle else (self._new_context(), None)
+        if page is None or page.is_closed():
+            page = context.new_page()
+        self._leased[page] = context
+        return page
+
+    def release(self, page: Page) -> None:
+        """Reset the page's context and return it to the pool.
+
+        Closes every page the test opened and restores cookies to the storage state
+        (localStorage is reset by an init script when the next page opens). A context
+        that cannot be reset (e.g. the browser crashed) is closed and replaced.
+        """
+        context = self._leased.pop(page)
+        try:
+            for open_page in list(context.pages):
+                open_page.close()
+            context.clear_cookies()
+            context.clear_permissions()
+            if self._state["cookies"]:
+                context.add_cookies(self._state["cookies"])
+            self._idle.append((context, self._prewarm(context)))
+        except Error:
+            context.close()
+            self._idle.append((self._new_context(), None))
+
+    def close(self) -> None:
+        """Close every context the pool created."""
+        for context in list(self._leased.values()) + [context for context, _ in self._idle]:
+            try:
+                context.close()
+            except Error:
+                pass  # browser already gone
+        self._leased.clear()
+        self._idle.clear()
+
+    def _new_context(self) -> BrowserContext:
+        context = self.browser.new_context(**self.context_args)
+        # Each new page starts from the saved localStorage instead of the previous test's leftovers.
+        context.add_init_script(_restore_storage_script(self._state["origins"]))
+        return context
+
+    def _prewarm(self, context: BrowserContext) -> Optional[Page]:
+        """Open a page and start loading `prewarm_url` without waiting for the load to finish."""
+        if not self.prewarm_url:
+            return None
+        page = context.new_page()
+        try:
+            # "commit" returns as soon as the response starts; the browser keeps loading.
+            page.goto(self.prewarm_url, wait_until="commit")
+        except Error:
+            page.close()
+            return None
+        return page
+
+    def _capture_storage_state(self, url: str, path: Path) -> None:
+        """Load `url` in a throwaway context and save the cookies/localStorage it ends up with."""
+        context = self.browser.new_context(**self.context_args)
+        try:
+            context.new_page().goto(url)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            context.storage_state(path=str(path))
+        finally:
+            context.close()
+
+
+def _restore_storage_script(origins: list[dict[str, Any]]) -> str:
+    """Init script: on a page's first document, replace localStorage with the saved values."""
+    data = {o["origin"]: {i["name"]: i["value"] for i in o.get("localStorage", [])} for o in origins}
+    return (
+        "(() => { try {"
+        f" const saved = {json.dumps(data)}[window.location.origin] || {{}};"
+        " if (window.sessionStorage.getItem('__pool_seeded')) return;"
+        " window.localStorage.clear();"
+        " for (const [k, v] of Object.entries(saved)) window.localStorage.setItem(k, v);"
+        " window.sessionStorage.setItem('__pool_seeded', '1');"
+        " } catch (e) { /* about:blank and opaque origins have no storage */ } })();"
+    )
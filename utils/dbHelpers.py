@@ -4,59 +4,369 @@
 from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
 
 # Stdlib
-import os  # read DB_PATH from environment
+import os  # read DB_PATH from environment (on first use)
 import sqlite3  # built-in SQLite driver
+import threading  # one cached connection per thread
+import time  # deadlines and backoff for wait_for_* helpers
+from contextlib import closing, contextmanager  # short-lived connections + pragma scopes
+from dataclasses import dataclass  # immutable catalog snapshot
 from pathlib import Path  # robust path handling
 
-from typing import Any, Iterable, Optional, Sequence, Tuple
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
 
-# Third‑party
-from dotenv import load_dotenv
+# The database path is resolved on first use (see `get_db_path`), not at import, so
+# importing this module does not read `.env` or the environment. `DB_PATH` is still
+# readable as a module attribute (via `__getattr__`) for existing callers; retarget
+# the helpers with `set_db_path`, not by assigning `DB_PATH`.
+_db_path: Optional[Path] = None
 
-# Load environment variables from .env (optional).
-load_dotenv()
+# Prepared-statement cache per connection. Our helpers issue a handful of distinct
+# statements; 32 leaves room for ad-hoc test queries without evicting them.
+STATEMENT_CACHE_SIZE = 32
 
-# Resolve the database path:
-# - Prefer DB_PATH from the environment if set
-# - Otherwise default to "<repo-root>/shop.db"
-DB_PATH: Path = Path(os.getenv("DB_PATH", Path(__file__).resolve().parent.parent / "shop.db"))
+# Connection pool state:
+# - `_local.connections` maps (path, readonly) -> connection for the current thread
+# - `_open_connections` tracks every connection so `close_connections()` can reach all threads
+# - `_generation` is bumped on close so threads drop their stale cache entries
+_local = threading.local()
+_open_connections: list[sqlite3.Connection] = []
+_pool_lock = threading.Lock()
+_generation = 0
 
-def get_connection() -> sqlite3.Connection:
-    """Return a new SQLite connection to the resolved DB_PATH."""
-    # sqlite3.connect accepts str or Path; cast to str for clarity
-    return sqlite3.connect(str(DB_PATH))
+# iter_rows: rows fetched from SQLite per round-trip. Large enough to amortize the
+# call overhead, small enough that memory stays flat for any table size.
+DEFAULT_BATCH_SIZE = 1000
 
+# Pragmas applied to the writable connection for the duration of a bulk write, and
+# the values they are restored to afterwards. `synchronous=OFF` skips fsync per
+# commit (test data only); the larger page cache keeps index pages in memory.
+_BULK_PRAGMAS = {"synchronous": "OFF", "cache_size": "-65536", "temp_store": "MEMORY"}
 
-def fetch_one(query: str, params: Sequence[Any] | None = None) -> Optional[Tuple[Any, ...]]:
+# wait_for_* helpers: how long to wait by default, and the backoff range between
+# change checks. Checks restart at the minimum whenever the database changes.
+DEFAULT_WAIT_TIMEOUT = 5.0
+_MIN_POLL_INTERVAL = 0.005
+_MAX_POLL_INTERVAL = 0.25
+
+# Query listeners (see `add_query_listener`), called as listener(query, params, seconds)
+# after each statement the public helpers run. Empty by default, so an unobserved
+# query only pays for one list check.
+QueryListener = Callable[[str, Optional[Tuple[Any, ...]], float], None]
+_query_listeners: list[QueryListener] = []
+
+# Catalog cache (see `get_catalog`): the last `items` snapshot and the key it was
+# loaded under. `_local_writes` is bumped by every write helper in this module, so
+# our own writes invalidate the cache even before `PRAGMA data_version` is checked.
+_catalog_lock = threading.Lock()
+_catalog: Optional["Catalog"] = None
+_catalog_key: Optional[tuple[Any, ...]] = None
+_local_writes = 0
+
+
+def _note_write() -> None:
+    """Record a write made through this module (invalidates the catalog cache)."""
+    global _local_writes
+    _local_writes += 1
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    """Call `listener(query, params, seconds)` after every statement run by this module's helpers.
+
+    Used by `plugins/query_profile.py`. `params` is None for `execute_many` / `set_cart`
+    batches. Internal bookkeeping (PRAGMAs, snapshot ATTACH/restore) is not reported.
+    """
+    _query_listeners.append(listener)
+
+
+def remove_query_listener(listener: QueryListener) -> None:
+    """Stop calling a listener added with `add_query_listener` (no-op if it is not registered)."""
+    if listener in _query_listeners:
+        _query_listeners.remove(listener)
+
+
+@contextmanager
+def _observed(query: str, params: Optional[Tuple[Any, ...]]) -> Iterator[None]:
+    """Time the block and report it to the query listeners, if any."""
+    if not _query_listeners:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        for listener in list(_query_listeners):
+            listener(query, params, elapsed)
+
+
+def get_db_path() -> Path:
+    """Return the SQLite file the helpers use, resolving it on the first call.
+
+    Resolution:
+    - Load `.env` (optional) into the environment
+    - Prefer DB_PATH from the environment if set
+    - Otherwise default to "<repo-root>/shop.db"
+    """
+    global _db_path
+    if _db_path is None:
+        from dotenv import load_dotenv  # deferred: only needed once something touches the DB
+
+        load_dotenv()
+        _db_path = Path(os.getenv("DB_PATH", Path(__file__).resolve().parent.parent / "shop.db"))
+    return _db_path
+
+
+def __getattr__(name: str) -> Any:
+    """Keep `dbHelpers.DB_PATH` readable now that the path is resolved lazily."""
+    if name == "DB_PATH":
+        return get_db_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def set_db_path(path: str | os.PathLike) -> None:
+    """Point every helper in this module at a different SQLite file.
+
+    Used by the per-worker mode in `conftest.py`, where each pytest-xdist worker
+    talks to its own copy of `shop.db`.
+    Assigning `dbHelpers.DB_PATH` does not retarget the helpers; call this instead.
+    """
+    global _db_path
+    _db_path = Path(path)
+
+
+def copy_database(dest: str | os.PathLike) -> Path:
+    """Write a consistent copy of the current database to `dest` and return its path.
+
+    Uses the sqlite3 backup API, so the copy is safe even while the app is writing.
+    """
+    dest = Path(dest)
+    with closing(sqlite3.connect(str(dest))) as dst:
+        get_connection().backup(dst)
+    return dest
+
+
+def restore_database(snapshot: str | os.PathLike, tables: Iterable[str] | None = None) -> None:
+    """Restore the current database from a snapshot written by `copy_database`.
+
+    Args:
+        snapshot: Path to the snapshot file.
+        tables: Only restore these tables (delete + re-insert from the snapshot in one
+            transaction). Optional; by default the whole database is restored with the
+            sqlite3 backup API, which copies pages without touching the app's schema.
+
+    Raises:
+        ValueError: If a requested table does not exist in the snapshot.
+    """
+    conn = get_connection()
+    _note_write()
+    if tables is None:
+        with closing(sqlite3.connect(str(snapshot))) as src:
+            src.backup(conn)
+        return
+
+    tables = list(tables)
+    conn.execute("ATTACH DATABASE ? AS golden", (str(snapshot),))
+    try:
+        known = {row[0] for row in conn.execute("SELECT name FROM golden.sqlite_master WHERE type = 'table'")}
+        unknown = [t for t in tables if t not in known]
+        if unknown:
+            raise ValueError(f"Tables not found in snapshot {snapshot}: {unknown}")
+        with conn:
+            for table in tables:
+                # Names were checked against the snapshot schema above, so quoting is safe.
+                conn.execute(f'DELETE FROM main."{table}"')
+                conn.execute(f'INSERT INTO main."{table}" SELECT * FROM golden."{table}"')
+                if "sqlite_sequence" in known:
+                    # Keep AUTOINCREMENT counters in step with the restored rows.
+                    conn.execute("DELETE FROM main.sqlite_sequence WHERE name = ?", (table,))
+                    conn.execute(
+                        "INSERT INTO main.sqlite_sequence SELECT * FROM golden.sqlite_sequence WHERE name = ?",
+                        (table,),
+                    )
+    finally:
+        conn.execute("DETACH DATABASE golden")
+
+
+def _connect(path: Path, readonly: bool) -> sqlite3.Connection:
+    """Open a new connection; read-only connections use a `file:...?mode=ro` URI."""
+    if readonly:
+        # mode=ro never creates the file, so a wrong DB_PATH fails loudly instead of
+        # silently reading an empty database.
+        target, uri = f"{path.resolve().as_uri()}?mode=ro", True
+    else:
+        # sqlite3.connect accepts str or Path; cast to str for clarity
+        target, uri = str(path), False
+    return sqlite3.connect(
+        target,
+        uri=uri,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        # Each connection is only used by the thread that opened it; this just lets
+        # close_connections() close it from the session teardown thread.
+        check_same_thread=False,
+    )
+
+
+def get_connection(readonly: bool = False) -> sqlite3.Connection:
+    """Return this thread's cached SQLite connection to the resolved DB_PATH.
+
+    The connection is opened on first use and reused by later calls from the same
+    thread (and pytest-xdist worker), so repeated reads skip connect/parse cost.
+
+    Args:
+        readonly: Use a read-only connection (for assertion reads). Optional.
+
+    Notes:
+        Do not close the returned connection; `close_connections()` does that at
+        session end (see the `db_connections` fixture in conftest.py).
+    """
+    if getattr(_local, "generation", None) != _generation:
+        _local.connections = {}
+        _local.generation = _generation
+
+    key = (_db_path or get_db_path(), readonly)  # no get_db_path() call (or phase-timing event) once resolved
+    conn = _local.connections.get(key)
+    if conn is None:
+        conn = _connect(*key)
+        _local.connections[key] = conn
+        with _pool_lock:
+            _open_connections.append(conn)
+    return conn
+
+
+def close_connections() -> None:
+    """Close every cached connection opened by any thread."""
+    global _generation
+    with _pool_lock:
+        for conn in _open_connections:
+            conn.close()
+        _open_connections.clear()
+        _generation += 1
+
+
+def fetch_one(
+    query: str, params: Sequence[Any] | None = None, readonly: bool = False
+) -> Optional[Tuple[Any, ...]]:
     """Execute a SELECT and return the first row (or None).
 
     Args:
         query: SQL SELECT statement with optional placeholders (e.g., '?').
         params: Values for the placeholders. Use a sequence (tuple/list). Optional.
+        readonly: Run on the read-only connection. Optional.
 
     Returns:
         A single row as a tuple (e.g., ('Koala',)) or None if no rows match.
     """
-    with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute(query, tuple(params or ()))
-        return cur.fetchone()
+    params = tuple(params or ())
+    with _observed(query, params):
+        return get_connection(readonly).execute(query, params).fetchone()
 
 
-def fetch_all(query: str, params: Sequence[Any] | None = None) -> list[Tuple[Any, ...]]:
+def fetch_all(
+    query: str, params: Sequence[Any] | None = None, readonly: bool = False
+) -> list[Tuple[Any, ...]]:
     """Execute a SELECT and return all rows.
 
     Args:
         query: SQL SELECT statement with optional placeholders.
         params: Values for the placeholders. Use a sequence (tuple/list). Optional.
+        readonly: Run on the read-only connection. Optional.
 
     Returns:
         A list of rows; each row is a tuple.
     """
-    with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute(query, tuple(params or ()))
-        return cur.fetchall()
+    params = tuple(params or ())
+    with _observed(query, params):
+        return get_connection(readonly).execute(query, params).fetchall()
+
+
+def iter_rows(
+    query: str,
+    params: Sequence[Any] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    readonly: bool = False,
+) -> Iterator[Tuple[Any, ...]]:
+    """Execute a SELECT and yield its rows one at a time, fetching `batch_size` per round-trip.
+
+    Unlike `fetch_all`, at most one batch is held in memory, so this is the helper to
+    use for tables with hundreds of thousands of rows.
+
+    Args:
+        query: SQL SELECT statement with optional placeholders.
+        params: Values for the placeholders. Use a sequence (tuple/list). Optional.
+        batch_size: Rows per `fetchmany` call. Optional.
+        readonly: Run on the read-only connection. Optional.
+
+    Yields:
+        Each row as a tuple.
+    """
+    params = tuple(params or ())
+    with _observed(query, params):  # times the first step; rows are then streamed
+        cursor = get_connection(readonly).execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()  # also when the caller stops iterating early
+
+
+@contextmanager
+def _bulk_write_pragmas(conn: sqlite3.Connection) -> Iterator[None]:
+    """Apply `_BULK_PRAGMAS` to `conn` for the duration of the block, then restore them."""
+    previous = {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in _BULK_PRAGMAS}
+    for name, value in _BULK_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+
+def execute_many(query: str, rows: Iterable[Sequence[Any]]) -> int:
+    """Execute one write statement for every parameter set in `rows`, in a single transaction.
+
+    `rows` may be a generator; it is consumed lazily, so seeding a large table does not
+    build the whole data set in memory.
+
+    Args:
+        query: SQL INSERT/UPDATE/DELETE with placeholders.
+        rows: One parameter sequence per execution.
+
+    Returns:
+        The number of rows changed.
+
+    Notes:
+        Runs with `synchronous=OFF` and a larger page cache (see `_BULK_PRAGMAS`); on
+        error the whole batch is rolled back.
+    """
+    _note_write()
+    conn = get_connection()
+    with _bulk_write_pragmas(conn), conn, _observed(query, None):
+        return conn.executemany(query, rows).rowcount
+        # Commit handled by the context manager on successful exit.
+
+
+def bulk_insert(table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Insert `rows` into `table` in one transaction (see `execute_many`).
+
+    Example:
+        bulk_insert("items", ("name", "price"), ((f"Item {n}", 1.0) for n in range(100_000)))
+
+    Returns:
+        The number of rows inserted.
+
+    Raises:
+        ValueError: If the table or a column name contains a double quote.
+    """
+    names = [table, *columns]
+    if any('"' in name for name in names):
+        raise ValueError(f"Invalid identifier in {names}")
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    return execute_many(f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})', rows)
 
 
 def execute_query(query: str, params: Sequence[Any] | None = None) -> None:
@@ -69,9 +379,10 @@ def execute_query(query: str, params: Sequence[Any] | None = None) -> None:
     Notes:
         Using the connection as a context manager commits on success and rolls back on error.
     """
-    with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute(query, tuple(params or ()))
+    _note_write()
+    params = tuple(params or ())
+    with get_connection() as conn, _observed(query, params):
+        conn.execute(query, params)
         # Commit handled by the context manager on successful exit.
 
 
@@ -81,12 +392,218 @@ def reset_table(table_name: str) -> None:
 
 
 def get_item_name(item_id: int) -> Optional[str]:
-    """Return the display name for an item id, or None if not found."""
-    row = fetch_one("SELECT name FROM items WHERE id = ?", (item_id,))
-    return row[0] if row else None
+    """Return the display name for an item id, or None if not found (cached; see `get_catalog`)."""
+    return get_catalog().names.get(item_id)
+
+
+def get_item_id(name: str) -> Optional[int]:
+    """Return the id of the item with this display name, or None if not found (cached)."""
+    return get_catalog().ids.get(name)
+
+
+def get_item_ids() -> list[int]:
+    """Return every item id in the catalog, ascending (cached)."""
+    return list(get_catalog().names)
 
 
 def get_cart_quantity(item_id: int) -> int:
     """Return the quantity for an item in the cart, or 0 if not present."""
-    row = fetch_one("SELECT quantity FROM cart WHERE item_id = ?", (item_id,))
+    row = fetch_one("SELECT quantity FROM cart WHERE item_id = ?", (item_id,), readonly=True)
     return int(row[0]) if row else 0
+
+
+def get_cart() -> dict[int, int]:
+    """Return the whole cart as `{item_id: quantity}`."""
+    rows = fetch_all("SELECT item_id, quantity FROM cart", readonly=True)
+    return {int(item_id): int(quantity) for item_id, quantity in rows}
+
+
+def set_cart(quantities: Mapping[int, int]) -> None:
+    """Replace the cart contents with `quantities` (`{item_id: quantity}`) in one transaction.
+
+    Leave an item out to keep it out of the cart; `{}` empties the cart.
+
+    Raises:
+        ValueError: If a quantity is below 1 or an item id is not in `items`
+            (checked before anything is written, so the cart is left unchanged).
+    """
+    not_positive = {item_id: qty for item_id, qty in quantities.items() if qty < 1}
+    if not_positive:
+        raise ValueError(f"Cart quantities must be at least 1, got {not_positive}")
+    unknown = sorted(set(quantities) - get_catalog().names.keys())
+    if unknown:
+        raise ValueError(f"Unknown item ids for the cart: {unknown}")
+    rows = list(quantities.items())
+    _note_write()
+    with get_connection() as conn:
+        with _observed("DELETE FROM cart", ()):
+            conn.execute("DELETE FROM cart")
+        with _observed("INSERT INTO cart (item_id, quantity) VALUES (?, ?)", None):
+            conn.executemany("INSERT INTO cart (item_id, quantity) VALUES (?, ?)", rows)
+        # Commit handled by the context manager on successful exit.
+
+
+def data_version() -> int:
+    """Return SQLite's `PRAGMA data_version` for the read-only connection.
+
+    The value changes whenever another connection (e.g., the app) commits a write,
+    which makes it a cheap change detector for polling.
+    """
+    return get_connection(readonly=True).execute("PRAGMA data_version").fetchone()[0]
+
+
+def explain_query_plan(query: str, params: Sequence[Any] | None = None) -> list[str]:
+    """Return SQLite's `EXPLAIN QUERY PLAN` for a statement, one detail string per step.
+
+    Example: `["SEARCH items USING INTEGER PRIMARY KEY (rowid=?)"]`.
+
+    Args:
+        query: Any SQL statement (it is planned, not executed).
+        params: Placeholder values. Optional; defaults to NULL for each `?`, which
+            does not change the plan.
+    """
+    params = tuple(params) if params is not None else (None,) * query.count("?")
+    rows = get_connection(readonly=True).execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan: Iterable[str]) -> list[str]:
+    """Return the plan steps that read a whole table or index (`SCAN ...`)."""
+    return [step for step in plan if step.startswith("SCAN ") and step != "SCAN CONSTANT ROW"]
+
+
+def assert_uses_index(query: str, params: Sequence[Any] | None = None, index: Optional[str] = None) -> None:
+    """Assert SQLite answers `query` with index lookups only (no full scans).
+
+    Args:
+        query: Statement to plan.
+        params: Placeholder values. Optional.
+        index: Name of an index the plan must mention (e.g. "idx_cart_item_id"). Optional.
+
+    Raises:
+        AssertionError: If any step is a full scan, or `index` is not used.
+    """
+    plan = explain_query_plan(query, params)
+    scans = full_scans(plan)
+    assert not scans, f"Expected {query!r} to use an index, but the plan scans: {scans} (plan: {plan})"
+    if index is not None:
+        assert any(index in step for step in plan), f"Expected {query!r} to use {index}; plan: {plan}"
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """In-memory snapshot of the `items` table.
+
+    Attributes:
+        names: `{item_id: name}`, in id order.
+        ids: `{name: item_id}`; if two items share a name, the lower id wins.
+    """
+
+    names: Mapping[int, str]
+    ids: Mapping[str, int]
+
+
+def get_catalog() -> Catalog:
+    """Return the cached catalog, reloading `items` only if the database changed.
+
+    The first call reads the whole table in one query. Later calls cost a single
+    `PRAGMA data_version` and return the same snapshot, until one of these happens:
+    - another connection (e.g. the app) commits a write,
+    - a write helper in this module runs (`execute_query`, `set_cart`, `restore_database`, ...),
+    - `set_db_path` points the module at another file, or `invalidate_catalog()` is called.
+    """
+    global _catalog, _catalog_key
+    conn = get_connection(readonly=True)
+    # data_version is per connection, so the connection (and pool generation) is part of the key.
+    key = (_db_path or get_db_path(), _generation, id(conn), _local_writes, conn.execute("PRAGMA data_version").fetchone()[0])
+    with _catalog_lock:
+        if _catalog is not None and _catalog_key == key:
+            return _catalog
+        names: dict[int, str] = {}
+        ids: dict[str, int] = {}
+        with _observed("SELECT id, name FROM items ORDER BY id", ()):
+            rows = conn.execute("SELECT id, name FROM items ORDER BY id").fetchall()
+        for item_id, name in rows:
+            names[int(item_id)] = name
+            ids.setdefault(name, int(item_id))
+        _catalog, _catalog_key = Catalog(names=names, ids=ids), key
+        return _catalog
+
+
+def invalidate_catalog() -> None:
+    """Drop the cached catalog so the next lookup reloads `items`."""
+    global _catalog, _catalog_key
+    with _catalog_lock:
+        _catalog, _catalog_key = None, None
+
+
+def wait_for_row(
+    query: str,
+    params: Sequence[Any] | None = None,
+    predicate: Callable[[Optional[Tuple[Any, ...]]], bool] = lambda row: row is not None,
+    timeout: float = DEFAULT_WAIT_TIMEOUT,
+) -> Optional[Tuple[Any, ...]]:
+    """Re-run a SELECT each time the database changes until `predicate(row)` is true.
+
+    The query runs once immediately, so an already-matching row returns with no delay.
+    After that it only re-runs when `PRAGMA data_version` changes; between checks we
+    sleep with exponential backoff (5 ms → 250 ms), resetting after every change.
+
+    Args:
+        query: SQL SELECT statement with optional placeholders.
+        params: Values for the placeholders. Use a sequence (tuple/list). Optional.
+        predicate: Called with the first row (or None). Defaults to "a row exists".
+        timeout: Seconds to wait before failing.
+
+    Returns:
+        The first row that satisfied `predicate`.
+
+    Raises:
+        AssertionError: If no matching row appears within `timeout`.
+    """
+    conn = get_connection(readonly=True)
+    params = tuple(params or ())
+    deadline = time.monotonic() + timeout
+    interval = _MIN_POLL_INTERVAL
+    seen_version = None
+
+    while True:
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != seen_version:
+            seen_version = version
+            with _observed(query, params):
+                row = conn.execute(query, params).fetchone()
+            if predicate(row):
+                return row
+            interval = _MIN_POLL_INTERVAL  # DB is changing: check again soon
+        else:
+            interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise AssertionError(f"Timed out after {timeout}s waiting for {query!r} {params}; last row: {row}")
+        time.sleep(min(interval, remaining))
+
+
+def wait_for_cart_quantity(item_id: int, expected: int, timeout: float = DEFAULT_WAIT_TIMEOUT) -> int:
+    """Wait until the cart quantity for an item equals `expected`, then return it.
+
+    Returns immediately when the quantity already matches; otherwise blocks only until
+    the next write that makes it match (see `wait_for_row`).
+
+    Raises:
+        AssertionError: If the quantity does not reach `expected` within `timeout`.
+    """
+    try:
+        wait_for_row(
+            "SELECT quantity FROM cart WHERE item_id = ?",
+            (item_id,),
+            predicate=lambda row: (int(row[0]) if row else 0) == expected,
+            timeout=timeout,
+        )
+    except AssertionError:
+        actual = get_cart_quantity(item_id)
+        raise AssertionError(
+            f"Expected quantity {expected} for item {item_id} within {timeout}s, got {actual}"
+        ) from None
+    return expected
@@ -0,0 +1,209 @@
+# utils/perf_helpers.py
+"""Load generation and latency statistics for the cart endpoints.
+
+Used by the `perf` suite in `tests/perf/`. A run drives one endpoint with a fixed
+number of concurrent workers for a fixed duration, then summarizes throughput and
+latency percentiles into a JSON-friendly dict that can be compared to a stored
+baseline.
+
+Example (from a sync test):
+
+    results, elapsed = run_load_sync(base_url, "GET", "/", concurrency=8, duration_s=5)
+    stats = summarize(results, elapsed)
+    regressions = compare_to_baseline("GET /", stats, baseline, threshold=0.2)
+
+`loglog_slope` / `scaling_slopes` turn the `scale` suite's `{size: ms}` measurements
+into growth exponents (1.0 = linear).
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import asyncio  # concurrent load workers
+import json  # report/baseline files
+import math  # nearest-rank percentiles
+import time  # run duration
+from collections import Counter  # status code counts
+from pathlib import Path  # robust path handling
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional
+
+if TYPE_CHECKING:
+    # Third‑party: async Playwright type for hints only
+    from playwright.async_api import APIRequestContext
+
+# Local: single timed request + async client runner
+from utils.async_api_helpers import RequestResult, run_with_api_context, timed_request
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended.
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Metrics compared against the baseline; "higher" means larger values are worse.
+BASELINE_METRICS = {
+    "p50_ms": "higher",
+    "p95_ms": "higher",
+    "p99_ms": "higher",
+    "throughput_rps": "lower",
+}
+
+
+async def run_load(
+    api_request_context: APIRequestContext,
+    method: str,
+    path: str,
+    concurrency: int,
+    duration_s: float,
+    data_factory: Optional[Callable[[int], Optional[Mapping[str, Any]]]] = None,
+    reset_every: int = 0,
+    reset_path: str = "/reset-cart",
+) -> tuple[list[RequestResult], float]:
+    """Send requests back-to-back from `concurrency` workers until `duration_s` elapses.
+
+    Args:
+        api_request_context: Async Playwright API request context.
+        method: HTTP method.
+        path: Endpoint path, e.g. "/add-to-cart".
+        concurrency: Number of workers, each with one request in flight.
+        duration_s: How long to keep sending new requests.
+        data_factory: Called with a running request number to build the POST body. Optional.
+        reset_every: Before every Nth request, POST `reset_path` (not timed or recorded), so
+            stateful endpoints like add-to-cart don't run into the app's limits. 0 = never.
+        reset_path: Endpoint used for those resets.
+
+    Returns:
+        (results, elapsed seconds) — every request sent, and the wall-clock run time.
+    """
+    results: list[RequestResult] = []
+    counter = iter(range(1 << 62))
+    started = time.perf_counter()
+    deadline = started + duration_s
+
+    async def _worker() -> None:
+        while time.perf_counter() < deadline:
+            n = next(counter)
+            if reset_every and n and n % reset_every == 0:
+                await api_request_context.post(reset_path)
+            data = data_factory(n) if data_factory else None
+            results.append(await timed_request(api_request_context, method, path, data))
+
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+def run_load_sync(
+    base_url: str,
+    method: str,
+    path: str,
+    concurrency: int,
+    duration_s: float,
+    data_factory: Optional[Callable[[int], Optional[Mapping[str, Any]]]] = None,
+    reset_every: int = 0,
+) -> tuple[list[RequestResult], float]:
+    """Sync wrapper around `run_load` for use from regular (sync) tests."""
+    return run_with_api_context(
+        base_url,
+        lambda context: run_load(context, method, path, concurrency, duration_s, data_factory, reset_every),
+    )
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def histogram(latencies_ms: list[float]) -> dict[str, int]:
+    """Count latencies per bucket, keyed like `"<=5ms"` (plus `">5000ms"`)."""
+    counts = {f"<={bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}
+    overflow = f">{HISTOGRAM_BUCKETS_MS[-1]}ms"
+    counts[overflow] = 0
+    for value in latencies_ms:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if value <= bound:
+                counts[f"<={bound}ms"] += 1
+                break
+        else:
+            counts[overflow] += 1
+    return counts
+
+
+def summarize(results: list[RequestResult], elapsed_s: float) -> dict[str, Any]:
+    """Summarize a load run: throughput, latency percentiles, histogram and status counts.
+
+    Requests that raised or returned 5xx count as errors. 4xx responses (e.g. the
+    app rejecting an item at max quantity) are counted separately as `rejected`;
+    they are still latency samples, but of the app's error path.
+    """
+    latencies = sorted(r.latency_ms for r in results)
+    errors = [r for r in results if r.error or r.status >= 500]
+    rejected = [r for r in results if not r.error and 400 <= r.status < 500]
+    return {
+        "requests": len(results),
+        "errors": len(errors),
+        "rejected": len(rejected),
+        "duration_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(results) / elapsed_s, 2) if elapsed_s else 0.0,
+        "min_ms": round(latencies[0], 2) if latencies else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "status_counts": {str(k): v for k, v in sorted(Counter(r.status for r in results).items())},
+        "histogram": histogram(latencies),
+    }
+
+
+def compare_to_baseline(
+    name: str, stats: Mapping[str, Any], baseline: Mapping[str, Any], threshold: float
+) -> list[str]:
+    """Return a message for every metric that regressed more than `threshold` (e.g. 0.2 = 20%).
+
+    Endpoints or metrics missing from the baseline, or baselines recorded at a
+    different `concurrency`, are not compared.
+    """
+    reference = baseline.get(name)
+    if not reference or reference.get("concurrency") != stats.get("concurrency"):
+        return []  # nothing recorded, or recorded under a different load level
+    regressions = []
+    for metric, worse in BASELINE_METRICS.items():
+        old, new = reference.get(metric), stats.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (worse == "higher" and change > threshold) or (worse == "lower" and -change > threshold):
+            regressions.append(f"{name} {metric}: {old} → {new} ({change:+.0%}, threshold ±{threshold:.0%})")
+    return regressions
+
+
+def loglog_slope(size_a: float, value_a: float, size_b: float, value_b: float) -> float:
+    """Growth exponent k in `value ∝ size^k` between two points (1.0 = linear, >1 = super-linear)."""
+    return math.log(value_b / value_a) / math.log(size_b / size_a)
+
+
+def scaling_slopes(curve: Mapping[int, float], floor: float = 1.0) -> list[dict[str, float]]:
+    """Log-log slope between each pair of consecutive sizes in a `{size: value}` curve.
+
+    Values are clamped to at least `floor` first, so timings lost in measurement noise
+    (e.g. 0.3 ms → 0.9 ms) do not show up as steep growth.
+
+    Returns:
+        `[{"from": size, "to": size, "slope": k}, ...]` in ascending size order.
+    """
+    points = sorted((size, max(value, floor)) for size, value in curve.items())
+    return [
+        {"from": a, "to": b, "slope": round(loglog_slope(a, va, b, vb), 3)}
+        for (a, va), (b, vb) in zip(points, points[1:])
+    ]
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    """Read a JSON report/baseline file, or return {} if it does not exist."""
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def write_json(path: Path, data: Mapping[str, Any]) -> None:
+    """Write `data` as pretty JSON, creating parent folders."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
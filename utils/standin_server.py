@@ -0,0 +1,272 @@
+# utils/standin_server.py
+"""In-process stand-in for the shop app (opt-in with `--standin`).
+
+A small Python HTTP server that implements the four routes the tests use,
+against the same SQLite schema `utils/dbHelpers.py` reads:
+
+- `GET /`             catalog with one add-to-cart form per item, the cart badge
+                      (`#cart-link span`) and flash messages
+- `GET /cart`         table with one row per cart line ("<name> <qty> $<total>")
+- `POST /add-to-cart` `itemId` as form or JSON; 302 back to `/` on success,
+                      400 + `{"error": ...}` for a bad id/quantity or at the max (10)
+- `POST /reset-cart`  empties the cart; 302 back to `/`
+
+It starts in milliseconds on a random port, needs no Node toolchain, and can run
+once per pytest-xdist worker. It is a stand-in, not a replacement: the real app is
+still what CI's main job tests, selected through `base_url` as before.
+"""
+
+from __future__ import annotations  # defer type-hint evaluation (only needed for < Python 3.11)
+
+# Stdlib
+import html  # escape item names in markup
+import json  # JSON bodies (Playwright `data=` sends JSON)
+import os  # atomic publish of a newly created database
+import sqlite3  # same DB the tests read
+import threading  # serve in the background
+from contextlib import closing  # short-lived per-request connections
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path  # robust path handling
+from typing import Any, Optional
+from urllib.parse import parse_qs, quote, urlparse  # form bodies + flash messages
+
+MAX_QUANTITY = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    price REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cart (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    quantity INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_cart_item_id ON cart(item_id);
+"""
+
+# Seeded only into a database file the stand-in creates itself (see `ensure_schema`).
+SEED_ITEMS = [
+    ("Koala", 12.00),
+    ("Kangaroo", 15.00),
+    ("Platypus", 18.00),
+    ("Wombat", 10.00),
+    ("Emu", 14.00),
+]
+
+ADDED_MESSAGE = "Item successfully added to cart"
+MAX_MESSAGE = "Maximum quantity reached"
+
+
+def ensure_schema(db_path: Path) -> bool:
+    """Create and seed `db_path` if the file does not exist; return True if it was created.
+
+    An existing file is never touched (no tables, seed rows or indexes are added), so
+    pointing `--standin` at the real app's `shop.db` leaves it as the app built it.
+    The new database is built under a temporary name and published with a hard link,
+    so concurrent xdist workers never see a half-built file and only one of them wins.
+    """
+    if db_path.exists():
+        return False
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    building = db_path.with_name(f".{db_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with closing(sqlite3.connect(str(building))) as conn, conn:
+            conn.executescript(SCHEMA)
+            conn.executemany("INSERT INTO items (name, price) VALUES (?, ?)", SEED_ITEMS)
+        os.link(building, db_path)
+    except FileExistsError:
+        return False  # another worker published it first
+    finally:
+        building.unlink(missing_ok=True)
+    return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_ShopServer"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real app
+
+    # -- routing ---------------------------------------------------------
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/":
+            message = parse_qs(url.query).get("message", [""])[0]
+            self._send_html(self._render_home(message))
+        elif url.path == "/cart":
+            self._send_html(self._render_cart())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        path = urlparse(self.path).path
+        body = self._read_body()
+        if path == "/add-to-cart":
+            self._add_to_cart(body)
+        elif path == "/reset-cart":
+            with self.server.write_lock, closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM cart")
+            self._redirect("/")
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    # -- actions ---------------------------------------------------------
+    def _add_to_cart(self, body: dict[str, Any]) -> None:
+        try:
+            item_id = int(body["itemId"])
+        except (KeyError, TypeError, ValueError):
+            self._send_json(400, {"error": "itemId is required"})
+            return
+        if "quantity" in body:
+            try:
+                quantity = int(body["quantity"])
+            except (TypeError, ValueError):
+                quantity = 0
+            if quantity <= 0:
+                self._send_json(400, {"error": "quantity must be positive"})
+                return
+
+        # One writer at a time in this process; BEGIN IMMEDIATE guards against other processes.
+        with self.server.write_lock, closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM items WHERE id = ?", (item_id,)).fetchone() is None:
+                conn.rollback()
+                self._send_json(400, {"error": f"Item {item_id} not found"})
+                return
+            row = conn.execute("SELECT quantity FROM cart WHERE item_id = ?", (item_id,)).fetchone()
+            if row and row[0] >= MAX_QUANTITY:
+                conn.rollback()
+                self._send_json(400, {"error": MAX_MESSAGE})
+                return
+            if row:
+                conn.execute("UPDATE cart SET quantity = quantity + 1 WHERE item_id = ?", (item_id,))
+            else:
+                conn.execute("INSERT INTO cart (item_id, quantity) VALUES (?, 1)", (item_id,))
+        self._redirect(f"/?message={quote(ADDED_MESSAGE)}")
+
+    # -- rendering -------------------------------------------------------
+    def _page(self, title: str, content: str, cart_count: int, message: str = "") -> str:
+        flash = f'<div class="message" role="status">{html.escape(message)}</div>' if message else ""
+        return (
+            "<!doctype html><html><head><meta charset='utf-8'>"
+            f"<title>{title}</title></head><body>"
+            f'<header><a href="/">Shop</a> <a id="cart-link" href="/cart">Cart <span>{cart_count}</span></a></header>'
+            f"{flash}<main>{content}</main></body></html>"
+        )
+
+    def _render_home(self, message: str) -> str:
+        with closing(self._connect()) as conn:
+            items = conn.execute(
+                "SELECT i.id, i.name, i.price, COALESCE(c.quantity, 0) "
+                "FROM items i LEFT JOIN cart c ON c.item_id = i.id ORDER BY i.id"
+            ).fetchall()
+            count = conn.execute("SELECT COALESCE(SUM(quantity), 0) FROM cart").fetchone()[0]
+        cards = []
+        for item_id, name, price, qty in items:
+            at_max = qty >= MAX_QUANTITY
+            cards.append(
+                f'<div class="item"><h2>{html.escape(name)}</h2><p>${price:.2f}</p>'
+                f'<form method="POST" action="/add-to-cart">'
+                f'<input type="hidden" name="itemId" value="{item_id}">'
+                f'<button type="submit"{" disabled" if at_max else ""}>Add to cart</button></form>'
+                f'{f"<p class=note>{MAX_MESSAGE}</p>" if at_max else ""}</div>'
+            )
+        return self._page("Shop", "".join(cards), count, message)
+
+    def _render_cart(self) -> str:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT i.id, i.name, c.quantity, i.price * c.quantity "
+                "FROM cart c JOIN items i ON i.id = c.item_id ORDER BY c.id"
+            ).fetchall()
+        count = sum(row[2] for row in rows)
+        body = "".join(
+            f"<tr><td>{html.escape(name)}</td><td>{qty}</td><td>${total:.2f}</td>"
+            f'<td><form method="POST" action="/add-to-cart"><input type="hidden" name="itemId" value="{item_id}">'
+            f'<button type="submit"{" disabled" if qty >= MAX_QUANTITY else ""}>+</button></form></td></tr>'
+            for item_id, name, qty, total in rows
+        )
+        table = f"<table><thead><tr><th>Item</th><th>Qty</th><th>Total</th><th></th></tr></thead><tbody>{body}</tbody></table>"
+        return self._page("Cart", table, count)
+
+    # -- plumbing --------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.server.db_path), timeout=10, isolation_level=None)
+
+    def _read_body(self) -> dict[str, Any]:
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if "json" in (self.headers.get("Content-Type") or ""):
+            try:
+                data = json.loads(raw or b"{}")
+            except ValueError:
+                return {}
+            return data if isinstance(data, dict) else {}
+        return {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_html(self, page: str) -> None:
+        self._send(200, page.encode(), "text/html; charset=utf-8")
+
+    def _send_json(self, status: int, data: dict[str, Any]) -> None:
+        self._send(status, json.dumps(data).encode(), "application/json")
+
+    def _redirect(self, location: str) -> None:
+        self._send(302, b"", "text/plain", {"Location": location})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # keep pytest output clean
+
+
+class _ShopServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], db_path: Path) -> None:
+        super().__init__(address, _Handler)
+        self.db_path = db_path
+        self.write_lock = threading.Lock()
+
+
+class StandInApp:
+    """Run the stand-in shop on a background thread.
+
+    Example:
+
+        app = StandInApp(db_path=Path("shop.db"))
+        base_url = app.start()  # e.g. http://127.0.0.1:50123
+        ...
+        app.stop()
+    """
+
+    def __init__(self, db_path: str | Path, port: int = 0) -> None:
+        self.db_path = Path(db_path)
+        self.port = port
+        self._server: Optional[_ShopServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> str:
+        """Create the schema if needed, start serving, and return the base URL."""
+        ensure_schema(self.db_path)
+        self._server = _ShopServer(("127.0.0.1", self.port), self.db_path)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-app", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
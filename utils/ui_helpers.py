@@ -1,22 +1,198 @@
 # utils/ui_helpers.py
 """UI helpers for common navigation and assertions in Playwright tests."""
 
-from playwright.sync_api import Page  # Playwright page object used by tests
+import time  # polling deadline for expect_page_state
+from dataclasses import dataclass, field  # typed page snapshot
+from typing import Callable, Mapping, Optional
+
+from playwright.sync_api import Error, Page, expect  # Playwright page object + web-first assertions
+
+# Reads Navigation Timing + Paint Timing for the current document in one round-trip.
+# All values are milliseconds from navigation start, except transfer_size (bytes).
+_NAVIGATION_METRICS_JS = """() => {
+    const nav = performance.getEntriesByType("navigation")[0];
+    const fcp = performance.getEntriesByName("first-contentful-paint")[0];
+    if (!nav) return null;
+    return {
+        url: nav.name,
+        ttfb_ms: nav.responseStart - nav.startTime,
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd - nav.startTime,
+        load_ms: nav.loadEventEnd - nav.startTime,
+        fcp_ms: fcp ? fcp.startTime : null,
+        transfer_size: nav.transferSize,
+    };
+}"""
+
+# Set by the `navigation_metrics` fixture in conftest.py when `--nav-metrics` is on.
+# Called as recorder(page_name, metrics) after each go_home()/go_cart().
+_navigation_recorder: Optional[Callable[[str, dict], None]] = None
+
+
+def set_navigation_recorder(recorder: Optional[Callable[[str, dict], None]]) -> None:
+    """Install (or remove, with None) the callback that receives navigation metrics."""
+    global _navigation_recorder
+    _navigation_recorder = recorder
+
+
+def capture_navigation_metrics(page: Page) -> Optional[dict]:
+    """Return TTFB, DOMContentLoaded, load, first contentful paint and transfer size for the current page.
+
+    Waits for the `load` event first so `load_ms` is populated. `fcp_ms` is None if
+    the browser has not reported a paint yet.
+    """
+    page.wait_for_load_state("load")
+    metrics = page.evaluate(_NAVIGATION_METRICS_JS)
+    if metrics:
+        metrics = {k: round(v, 1) if isinstance(v, float) else v for k, v in metrics.items()}
+    return metrics
+
+
+def assert_navigation_budget(name: str, metrics: Mapping[str, object], budgets: Mapping[str, float]) -> None:
+    """Assert every metric with a budget stays within it.
+
+    Args:
+        name: Page name for the message (e.g. "home").
+        metrics: Output of `capture_navigation_metrics`.
+        budgets: Limits keyed by metric name (e.g. {"load_ms": 3000}).
+    """
+    over = {
+        metric: (metrics[metric], limit)
+        for metric, limit in budgets.items()
+        if isinstance(metrics.get(metric), (int, float)) and metrics[metric] > limit
+    }
+    assert not over, f"Navigation budget exceeded on {name}: " + ", ".join(
+        f"{metric}={value} > {limit}" for metric, (value, limit) in over.items()
+    )
+
+
+def _record_navigation(page: Page, name: str) -> None:
+    if _navigation_recorder is not None:
+        metrics = capture_navigation_metrics(page)
+        if metrics:
+            _navigation_recorder(name, metrics)
+
 
 def go_home(page: Page, base_url: str) -> None:
     """Navigate to the app homepage and wait for DOM readiness.
 
     This relies on Playwright's built-in auto-waiting. We avoid explicit timeouts
     unless we encounter slow environments (e.g., CI) where defaults are insufficient.
+    With `--nav-metrics`, page-load timings are recorded and checked against budgets.
     """
     page.goto(base_url)
     page.wait_for_url(base_url)
     page.wait_for_load_state("domcontentloaded")
+    _record_navigation(page, "home")
+
+
+def go_cart(page: Page, base_url: str) -> None:
+    """Navigate to the /cart page and wait for DOM readiness (metrics as in `go_home`)."""
+    page.goto(f"{base_url}/cart")
+    page.wait_for_url("**/cart")
+    page.wait_for_load_state("domcontentloaded")
+    _record_navigation(page, "cart")
+
+
+# Reads everything UI assertions usually need in one page.evaluate round-trip.
+_PAGE_STATE_JS = """() => {
+    const text = (el) => (el.innerText || el.textContent || "").trim();
+    const badge = document.querySelector("#cart-link span");
+    const messages = [...document.querySelectorAll(
+        '[role="alert"], [role="status"], .alert, .flash, .message, .notification'
+    )].map(text).filter(Boolean);
+    const itemButtons = {};
+    for (const form of document.querySelectorAll("form")) {
+        const input = form.querySelector('input[name="itemId"]');
+        const button = form.querySelector("button, input[type=submit]");
+        if (input && button) itemButtons[input.value] = !button.disabled;
+    }
+    const cartRows = [...document.querySelectorAll("table tr")]
+        .filter((row) => row.querySelector("td"))
+        .map((row) => [...row.querySelectorAll("td, th")].map(text));
+    return {
+        url: location.href,
+        cartCount: badge ? text(badge) : null,
+        text: document.body ? document.body.innerText : "",
+        messages,
+        itemButtons,
+        cartRows,
+    };
+}"""
+
+# Poll intervals (ms) for expect_page_state, mirroring Playwright's expect() backoff.
+_POLL_INTERVALS_MS = (0, 50, 100, 250, 500)
+
+
+@dataclass
+class PageState:
+    """Snapshot of the page read by `read_page_state` (one browser round-trip)."""
+
+    url: str
+    cart_count: Optional[int]  # header badge; None if missing or not numeric
+    text: str  # rendered text of <body> (hidden elements excluded)
+    messages: list[str] = field(default_factory=list)  # flash/alert/status messages
+    item_buttons: dict[int, bool] = field(default_factory=dict)  # itemId -> add button enabled
+    cart_rows: list[list[str]] = field(default_factory=list)  # /cart table cells per row
+
+    def has_text(self, text: str) -> bool:
+        """True if `text` appears in the rendered page text."""
+        return text in self.text
+
+
+def read_page_state(page: Page) -> PageState:
+    """Read cart badge, messages, per-item button state and cart rows in one `page.evaluate`."""
+    raw = page.evaluate(_PAGE_STATE_JS)
+    count = (raw["cartCount"] or "").strip()
+    return PageState(
+        url=raw["url"],
+        cart_count=int(count) if count.isdigit() else None,
+        text=raw["text"],
+        messages=raw["messages"],
+        item_buttons={int(k): v for k, v in raw["itemButtons"].items() if k.isdigit()},
+        cart_rows=raw["cartRows"],
+    )
+
+
+def expect_page_state(
+    page: Page, predicate: Callable[[PageState], bool], description: str, timeout: float = 5000
+) -> PageState:
+    """Poll page snapshots until `predicate(state)` is true, then return that state.
+
+    Each poll is a single `page.evaluate`, so one assertion costs one round-trip when
+    the page is already right, and a few more only while it is still changing.
+
+    A poll that fails because the page is navigating (e.g. "Execution context was
+    destroyed" during a form-submit redirect) is retried like an unmet predicate.
+
+    Args:
+        page: Playwright page.
+        predicate: Check applied to each snapshot.
+        description: What was expected, for the failure message.
+        timeout: Milliseconds to keep polling.
+
+    Raises:
+        AssertionError: If the predicate never holds; includes the last snapshot.
+    """
+    deadline = time.monotonic() + timeout / 1000
+    attempt = 0
+    while True:
+        try:
+            state = read_page_state(page)
+        except Error as exc:  # page mid-navigation; the next document will answer
+            last = f"page not readable ({exc.message.splitlines()[0]})"
+        else:
+            if predicate(state):
+                return state
+            last = f"cart_count={state.cart_count}, messages={state.messages}, url={state.url}"
+        if time.monotonic() >= deadline:
+            raise AssertionError(f"Expected {description} within {timeout:.0f} ms; last state: {last}")
+        page.wait_for_timeout(_POLL_INTERVALS_MS[min(attempt, len(_POLL_INTERVALS_MS) - 1)])
+        attempt += 1
 
 
 def expect_text_visible(page: Page, text: str) -> None:
-    """Assert that the given text is visible somewhere on the page."""
-    assert page.get_by_text(text).first.is_visible(), f"'{text}' not visible on page"
+    """Assert that the given text is visible somewhere on the page (waits for it to appear)."""
+    expect(page.get_by_text(text).first, f"'{text}' not visible on page").to_be_visible()
 
 
 def get_cart_count(page: Page) -> int:
@@ -24,7 +200,5 @@ def get_cart_count(page: Page) -> int:
     return int(page.locator("#cart-link span").inner_text().strip())
 
 def expect_cart_count(page: Page, expected: int) -> None:
-    """Assert the cart badge shows the expected count."""
-    assert get_cart_count(page) == expected, (
-        f"Expected cart count {expected}, got {get_cart_count(page)}"
-    )
\ No newline at end of file
+    """Assert the cart badge shows the expected count (polls one page snapshot at a time)."""
+    expect_page_state(page, lambda state: state.cart_count == expected, f"cart count {expected}")
\ No newline at end of file